@@ -0,0 +1,49 @@
+"""Make idempotency_records UNLOGGED, store response_body as text, index expires_at.
+
+幂等记录仅保留 24 小时，崩溃后丢失可以接受，因此改为 UNLOGGED 以跳过 WAL。
+response_body 由应用层一次性序列化为 JSON 文本写入，回放时再解析，避免重复编码。
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op  # type: ignore[attr-defined]
+
+# revision identifiers, used by Alembic.
+revision = "202610160011"
+down_revision = "202601130010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        "idempotency_records",
+        "response_body",
+        existing_type=sa.JSON(),
+        type_=sa.Text(),
+        existing_nullable=False,
+        postgresql_using="response_body::text",
+    )
+    op.create_index(
+        "ix_idempotency_records_expires_at",
+        "idempotency_records",
+        ["expires_at"],
+    )
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("ALTER TABLE idempotency_records SET UNLOGGED")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("ALTER TABLE idempotency_records SET LOGGED")
+    op.drop_index("ix_idempotency_records_expires_at", table_name="idempotency_records")
+    op.alter_column(
+        "idempotency_records",
+        "response_body",
+        existing_type=sa.Text(),
+        type_=sa.JSON(),
+        existing_nullable=False,
+        postgresql_using="response_body::json",
+    )
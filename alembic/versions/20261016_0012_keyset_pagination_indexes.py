@@ -0,0 +1,33 @@
+"""Add composite indexes for keyset pagination on documents and nodes.
+
+文档列表按 (position, id) 排序、节点列表按 (created_at, id) 排序，
+游标翻页需要对应的复合索引才能直接定位到下一页。
+"""
+
+from __future__ import annotations
+
+from alembic import op  # type: ignore[attr-defined]
+
+# revision identifiers, used by Alembic.
+revision = "202610160012"
+down_revision = "202610160011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_documents_position_id",
+        "documents",
+        ["position", "id"],
+    )
+    op.create_index(
+        "ix_nodes_created_at_id",
+        "nodes",
+        ["created_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_nodes_created_at_id", table_name="nodes")
+    op.drop_index("ix_documents_position_id", table_name="documents")
@@ -0,0 +1,49 @@
+"""Add partial composite indexes matching active-row ordering queries.
+
+同级节点（fetch_siblings）、按类型的文档列表与节点列表默认只看未删除的行，
+并按 (position, id) / (created_at, id) 排序。部分索引只包含 deleted_at IS NULL 的行，
+且列顺序与 WHERE + ORDER BY 一致，查询可以按索引顺序扫描并在 LIMIT 处停止，
+无需额外的 Sort 节点。
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op  # type: ignore[attr-defined]
+
+# revision identifiers, used by Alembic.
+revision = "202610160013"
+down_revision = "202610160012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_nodes_parent_position_active",
+        "nodes",
+        ["parent_id", "position", "id"],
+        postgresql_where=sa.text("deleted_at IS NULL"),
+        sqlite_where=sa.text("deleted_at IS NULL"),
+    )
+    op.create_index(
+        "ix_nodes_created_at_active",
+        "nodes",
+        [sa.text("created_at DESC"), sa.text("id DESC")],
+        postgresql_where=sa.text("deleted_at IS NULL"),
+        sqlite_where=sa.text("deleted_at IS NULL"),
+    )
+    op.create_index(
+        "ix_documents_type_position_active",
+        "documents",
+        ["type", "position", "id"],
+        postgresql_where=sa.text("deleted_at IS NULL"),
+        sqlite_where=sa.text("deleted_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_documents_type_position_active", table_name="documents")
+    op.drop_index("ix_nodes_created_at_active", table_name="nodes")
+    op.drop_index("ix_nodes_parent_position_active", table_name="nodes")
@@ -0,0 +1,40 @@
+"""Add document_positions allocator table.
+
+新文档的 position 原先按 MAX(position) + 1 计算，并发创建时会得到相同的值。
+改为按类型维护计数器，INSERT ... ON CONFLICT DO UPDATE ... RETURNING 原子分配；
+迁移时以现有文档（含已软删）的最大 position 初始化。
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op  # type: ignore[attr-defined]
+
+# revision identifiers, used by Alembic.
+revision = "202610160014"
+down_revision = "202610160013"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "document_positions",
+        sa.Column("type_key", sa.String(length=32), primary_key=True),
+        sa.Column("next_pos", sa.BigInteger(), nullable=False),
+    )
+    op.execute(
+        sa.text(
+            """
+            INSERT INTO document_positions (type_key, next_pos)
+            SELECT coalesce(type, ''), max(position) + 1
+            FROM documents
+            GROUP BY coalesce(type, '')
+            """
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("document_positions")
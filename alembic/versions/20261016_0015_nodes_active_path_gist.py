@@ -0,0 +1,37 @@
+"""Add partial GiST index on nodes.path for active rows.
+
+子树查询改用 path <@ root 后，默认只看未删除节点；部分 GiST 索引只覆盖
+deleted_at IS NULL 的行，体积更小、选择性更高。
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op  # type: ignore[attr-defined]
+
+# revision identifiers, used by Alembic.
+revision = "202610160015"
+down_revision = "202610160014"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    index_kwargs: dict[str, object] = (
+        {"postgresql_using": "gist"}
+        if op.get_bind().dialect.name == "postgresql"
+        else {}
+    )
+    op.create_index(
+        "ix_nodes_path_tree_active",
+        "nodes",
+        ["path"],
+        postgresql_where=sa.text("deleted_at IS NULL"),
+        sqlite_where=sa.text("deleted_at IS NULL"),
+        **index_kwargs,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_nodes_path_tree_active", table_name="nodes")
@@ -0,0 +1,40 @@
+"""Store the latest version number on documents.
+
+Document.version_number 原为关联 document_versions 的 MAX() 相关子查询，
+每条 SELECT documents 都会为每一行执行一次；改为写入版本快照时原子递增的计数列。
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op  # type: ignore[attr-defined]
+
+# revision identifiers, used by Alembic.
+revision = "202610160017"
+down_revision = "202610160016"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "documents",
+        sa.Column("version_number", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.execute(
+        """
+        UPDATE documents AS d
+        SET version_number = v.max_version
+        FROM (
+            SELECT document_id, MAX(version_number) AS max_version
+            FROM document_versions
+            GROUP BY document_id
+        ) AS v
+        WHERE v.document_id = d.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("documents", "version_number")
@@ -0,0 +1,44 @@
+"""Add covering index for document version history pagination.
+
+版本历史按 version_number 倒序 OFFSET/LIMIT 分页。新索引 INCLUDE id、
+snapshot_title、created_at，翻页时先在索引上仅扫描定位本页 id，被 OFFSET 跳过的
+行不再回表读取大字段所在的堆页。
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op  # type: ignore[attr-defined]
+
+# revision identifiers, used by Alembic.
+revision = "202610160019"
+down_revision = "202610160018"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_document_versions_document_version_desc",
+            "document_versions",
+            ["document_id", sa.text("version_number DESC")],
+            postgresql_include=["id", "snapshot_title", "created_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_document_versions_document_version_desc",
+            table_name="document_versions",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,44 @@
+"""Convert serial primary keys to identity columns.
+
+documents / nodes / document_versions / assets 的 id 由 BIGSERIAL（独立序列 + 默认值）
+改为 ``GENERATED BY DEFAULT AS IDENTITY``：序列由列本身持有，权限与复制表结构时随列一起处理。
+转换前删除旧序列，再把新标识序列推进到当前最大 id 之后，已有数据与 id 不变。
+"""
+
+from __future__ import annotations
+
+from alembic import op  # type: ignore[attr-defined]
+
+# revision identifiers, used by Alembic.
+revision = "202610160020"
+down_revision = "202610160019"
+branch_labels = None
+depends_on = None
+
+_TABLES = ("documents", "nodes", "document_versions", "assets")
+
+
+def _restart_sequence(table: str, sequence: str) -> None:
+    op.execute(
+        f"SELECT setval({sequence}, COALESCE(MAX(id), 0) + 1, false) FROM {table}"
+    )
+
+
+def upgrade() -> None:
+    for table in _TABLES:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN id DROP DEFAULT")
+        op.execute(f"DROP SEQUENCE IF EXISTS {table}_id_seq")
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY"
+        )
+        _restart_sequence(table, f"pg_get_serial_sequence('{table}', 'id')")
+
+
+def downgrade() -> None:
+    for table in _TABLES:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN id DROP IDENTITY IF EXISTS")
+        op.execute(f"CREATE SEQUENCE {table}_id_seq OWNED BY {table}.id")
+        _restart_sequence(table, f"'{table}_id_seq'")
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT nextval('{table}_id_seq')"
+        )
@@ -0,0 +1,49 @@
+"""Narrow idempotency request_hash and make the expiry index partial.
+
+request_hash 保存的是 SHA-256 十六进制摘要，固定 64 个字符，列宽收窄为 VARCHAR(64)。
+过期清理只按 ``expires_at <= :threshold`` 删除，expires_at 为空的记录不会命中，
+索引改为 ``WHERE expires_at IS NOT NULL`` 的部分索引。
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op  # type: ignore[attr-defined]
+
+# revision identifiers, used by Alembic.
+revision = "202610160021"
+down_revision = "202610160020"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        "idempotency_records",
+        "request_hash",
+        type_=sa.String(length=64),
+        existing_type=sa.String(length=128),
+        existing_nullable=False,
+    )
+    op.drop_index("ix_idempotency_records_expires_at", table_name="idempotency_records")
+    op.create_index(
+        "ix_idempotency_records_expires_at",
+        "idempotency_records",
+        ["expires_at"],
+        postgresql_where=sa.text("expires_at IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_idempotency_records_expires_at", table_name="idempotency_records")
+    op.create_index(
+        "ix_idempotency_records_expires_at", "idempotency_records", ["expires_at"]
+    )
+    op.alter_column(
+        "idempotency_records",
+        "request_hash",
+        type_=sa.String(length=128),
+        existing_type=sa.String(length=64),
+        existing_nullable=False,
+    )
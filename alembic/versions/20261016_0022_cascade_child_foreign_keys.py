@@ -0,0 +1,45 @@
+"""Cascade child rows at the database level when purging documents or nodes.
+
+document_versions.document_id、node_documents 的两个外键与 node_assets.node_id 改为
+ON DELETE CASCADE。ORM 关系配合 passive_deletes=True，彻底删除文档或节点时
+不再先逐条加载版本与绑定行，由 PostgreSQL 在同一条 DELETE 中级联清理。
+"""
+
+from __future__ import annotations
+
+from alembic import op  # type: ignore[attr-defined]
+
+# revision identifiers, used by Alembic.
+revision = "202610160022"
+down_revision = "202610160021"
+branch_labels = None
+depends_on = None
+
+# (约束名, 子表, 外键列, 父表)
+_FOREIGN_KEYS = (
+    (
+        "document_versions_document_id_fkey",
+        "document_versions",
+        "document_id",
+        "documents",
+    ),
+    ("node_documents_node_id_fkey", "node_documents", "node_id", "nodes"),
+    ("node_documents_document_id_fkey", "node_documents", "document_id", "documents"),
+    ("node_assets_node_id_fkey", "node_assets", "node_id", "nodes"),
+)
+
+
+def _recreate(ondelete: str | None) -> None:
+    for name, table, column, referent in _FOREIGN_KEYS:
+        op.drop_constraint(name, table, type_="foreignkey")
+        op.create_foreign_key(
+            name, table, referent, [column], ["id"], ondelete=ondelete
+        )
+
+
+def upgrade() -> None:
+    _recreate("CASCADE")
+
+
+def downgrade() -> None:
+    _recreate(None)
@@ -0,0 +1,49 @@
+"""Add a pg_trgm GIN index for asset filename search.
+
+资源搜索为 ``filename ILIKE '%q%'``，前导通配符使 B-tree 无法使用，
+为 ``assets.filename`` 建立 gin_trgm_ops 索引。文档搜索为
+``title ILIKE '%q%' OR content::text ILIKE '%q%'``，正文一侧无法建索引，
+OR 条件只能顺序扫描，标题索引用不上，因此不为文档建立三元组索引。
+降级只删除索引，pg_trgm 扩展保留（可能被其他对象依赖）。
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op  # type: ignore[attr-defined]
+
+# revision identifiers, used by Alembic.
+revision = "202610160023"
+down_revision = "202610160022"
+branch_labels = None
+depends_on = None
+
+# (索引名, 表, 索引表达式)
+_INDEXES = (("ix_assets_filename_trgm", "assets", "filename gin_trgm_ops"),)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        for name, table, expression in _INDEXES:
+            op.create_index(
+                name,
+                table,
+                [sa.text(expression)],
+                postgresql_using="gin",
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        for name, table, _ in _INDEXES:
+            op.drop_index(
+                name, table_name=table, postgresql_concurrently=True, if_exists=True
+            )
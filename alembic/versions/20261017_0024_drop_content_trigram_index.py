@@ -0,0 +1,33 @@
+"""Drop the trigram index on documents.content.
+
+``ix_documents_content_trgm`` 覆盖整份 JSON 正文：每次正文写入都要重建全部三元组，
+索引体积可能超过表本身，而文档更新（连同版本快照）是最热的写路径。
+202610160023 已不再创建该索引，本迁移为已执行过旧版 202610160023 的库将其删除。
+降级不重建：该索引不属于任何版本的预期结构。
+"""
+
+from __future__ import annotations
+
+from alembic import op  # type: ignore[attr-defined]
+
+# revision identifiers, used by Alembic.
+revision = "202610170024"
+down_revision = "202610160023"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_documents_content_trgm",
+            table_name="documents",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    pass
@@ -0,0 +1,33 @@
+"""Drop the trigram index on documents.title.
+
+文档搜索为 ``title ILIKE '%q%' OR content::text ILIKE '%q%'``，正文一侧没有索引，
+规划器只能对整个 OR 条件顺序扫描，``ix_documents_title_trgm`` 从未被使用，
+只增加写入时的 GIN 维护成本。202610160023 已不再创建该索引，本迁移为已执行过
+旧版 202610160023 的库将其删除。降级不重建。
+"""
+
+from __future__ import annotations
+
+from alembic import op  # type: ignore[attr-defined]
+
+# revision identifiers, used by Alembic.
+revision = "202610170025"
+down_revision = "202610170024"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_documents_title_trgm",
+            table_name="documents",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    pass
@@ -0,0 +1,104 @@
+"""Consolidate ordering indexes into partial (position, id) / (created_at, id).
+
+列表与游标翻页默认只看 ``deleted_at IS NULL`` 的行，但排序键上此前叠了多份索引：
+documents 有全表的 (position, id) 与部分的 (type, position, id)，nodes 有全表的
+(created_at, id) 与部分的 (created_at DESC, id DESC)。它们相互重叠，只增加写入
+与 VACUUM 成本。本迁移只保留两条部分复合索引，其余 CONCURRENTLY 删除：
+
+- ``ix_documents_position_id_active``: documents (position, id) WHERE deleted_at IS NULL
+- ``ix_nodes_created_at_id_active``: nodes (created_at, id) WHERE deleted_at IS NULL
+
+B-tree 可反向扫描，节点列表的 DESC 排序同样走 ``ix_nodes_created_at_id_active``。
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op  # type: ignore[attr-defined]
+
+# revision identifiers, used by Alembic.
+revision = "202610170026"
+down_revision = "202610170025"
+branch_labels = None
+depends_on = None
+
+_ACTIVE = sa.text("deleted_at IS NULL")
+
+_KEPT: tuple[tuple[str, str, list[str]], ...] = (
+    ("ix_documents_position_id_active", "documents", ["position", "id"]),
+    ("ix_nodes_created_at_id_active", "nodes", ["created_at", "id"]),
+)
+
+_DROPPED: tuple[tuple[str, str], ...] = (
+    ("ix_documents_position_id", "documents"),
+    ("ix_documents_type_position_active", "documents"),
+    ("ix_nodes_created_at_id", "nodes"),
+    ("ix_nodes_created_at_active", "nodes"),
+)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        # 先建好保留的索引，再删除重叠的索引，期间排序查询始终有索引可用
+        for name, table, columns in _KEPT:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_where=_ACTIVE,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        for name, table in _DROPPED:
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_documents_position_id",
+            "documents",
+            ["position", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_documents_type_position_active",
+            "documents",
+            ["type", "position", "id"],
+            postgresql_where=_ACTIVE,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_nodes_created_at_id",
+            "nodes",
+            ["created_at", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_nodes_created_at_active",
+            "nodes",
+            [sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_where=_ACTIVE,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        for name, table, _columns in _KEPT:
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,44 @@
+"""Drop the single-column partial index on documents.position.
+
+202610160018 把 ``ix_documents_position`` 改成了 ``WHERE deleted_at IS NULL`` 的部分索引，
+但它与 ``ix_documents_position_id_active`` (position, id) 条件相同、前导列相同，
+按 position 过滤或排序的查询都能由后者满足，单列版本只是多一份写入开销，因此删除。
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op  # type: ignore[attr-defined]
+
+# revision identifiers, used by Alembic.
+revision = "202610170027"
+down_revision = "202610170026"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_documents_position",
+            table_name="documents",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_documents_position",
+            "documents",
+            ["position"],
+            postgresql_where=sa.text("deleted_at IS NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
@@ -1,10 +1,11 @@
 import logging
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
 from fastapi import Header, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.common.config import get_settings
-from app.infra.db.session import get_session_factory
+from app.infra.db.session import get_async_session_factory, get_session_factory
 
 
 def get_db() -> Generator:
@@ -19,6 +20,15 @@ def get_db() -> Generator:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with get_async_session_factory()() as db:
+        try:
+            yield db
+        except Exception:
+            await db.rollback()
+            raise
+
+
 def get_request_context(
     x_user_id: str | None = Header(default=None),
     x_request_id: str | None = Header(default=None),
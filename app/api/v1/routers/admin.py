@@ -9,8 +9,9 @@ from sqlalchemy.orm import Session
 
 from app.api.v1.deps import get_db, require_admin_key
 from app.app.services.node_service import NodeService
+from app.domain.repositories.batch_count import batch_count
 from app.infra.db.alembic_support import get_head_revision
-from app.infra.db.models import IdempotencyRecord
+from app.infra.db.models import Asset, Document, IdempotencyRecord, Node
 
 router = APIRouter(dependencies=[Depends(require_admin_key)])
 
@@ -81,19 +82,27 @@ def self_check(db: Session = Depends(get_db)) -> dict[str, Any]:
     expected_indexes = {
         "nodes": {
             "ix_nodes_path_tree",
+            "ix_nodes_path_tree_active",
             "uq_nodes_path_active",
             "uq_nodes_parent_name_active",
             "ix_nodes_type",
             "ix_nodes_parent_position",
             "ix_nodes_parent_id",
+            "ix_nodes_created_at_id_active",
+            "ix_nodes_parent_position_active",
         },
         "documents": {
-            "ix_documents_metadata_gin",
+            "ix_documents_metadata_path_ops",
             "ix_documents_type",
-            "ix_documents_position",
-            "ix_documents_type_position",
+            "ix_documents_position_id_active",
         },
+        "assets": {"ix_assets_filename_trgm"},
         "node_documents": {"ix_node_documents_document_id"},
+        "document_versions": {
+            "uq_document_versions_document_version",
+            "ix_document_versions_document_version_desc",
+        },
+        "idempotency_records": {"ix_idempotency_records_expires_at"},
     }
     index_report: dict[str, Any] = {}
     for table, names in expected_indexes.items():
@@ -203,6 +212,24 @@ def reindex_or_analyze(
     return {"executed": executed, "method": method, "dialect": bind.dialect.name}
 
 
+@router.get("/admin/stats/row-counts")
+def row_counts(db: Session = Depends(get_db)) -> dict[str, Any]:
+    """按主键区间分批统计各主表的活跃行数。
+
+    每批语句成本有上界，大表上也不会因单条 COUNT 触发 statement_timeout；
+    往返次数随主键跨度增长，适合运维巡检，不适合高频调用。
+    """
+    counts = {
+        name: batch_count(db, model.id, model.deleted_at.is_(None))
+        for name, model in (
+            ("documents", Document),
+            ("nodes", Node),
+            ("assets", Asset),
+        )
+    }
+    return {"active": counts, "timestamp": datetime.now(timezone.utc).isoformat()}
+
+
 @router.post("/admin/recalculate-doc-counts")
 def recalculate_doc_counts(db: Session = Depends(get_db)) -> dict[str, Any]:
     """全量重算所有节点的子树文档计数。
@@ -152,10 +152,10 @@ def complete_multipart_upload(
 
     def executor():
         try:
-            parts = [
+            parts = tuple(
                 CompletedPart(part_number=p.part_number, etag=p.etag)
                 for p in payload.parts
-            ]
+            )
             return asset_service.complete_multipart_upload(
                 asset_id, parts=parts, user_id=user_id
             )
@@ -18,7 +18,11 @@ from app.api.v1.schemas.documents import (
     DocumentsPage,
     DocumentUpdate,
 )
-from app.api.v1.utils import extract_metadata_filters
+from app.api.v1.utils import (
+    decode_document_cursor,
+    encode_cursor,
+    extract_metadata_filters,
+)
 from app.app.services import (
     DocumentCreateData,
     DocumentNotFoundError,
@@ -245,6 +249,7 @@ def list_documents(
     search: str | None = Query(default=None, alias="query"),
     type: str | None = Query(default=None),
     ids: list[int] | None = Query(default=None, alias="id"),
+    cursor: str | None = Query(default=None),
     db: Session = Depends(get_db),
 ):
     services = get_service_bundle(db)
@@ -258,8 +263,18 @@ def list_documents(
         search_query=search,
         doc_type=type,
         doc_ids=ids or None,
+        cursor=decode_document_cursor(cursor) if cursor else None,
     )
-    return {"page": page, "size": size, "total": total, "items": items}
+    next_cursor = None
+    if len(items) == size:
+        next_cursor = encode_cursor(items[-1].position, items[-1].id)
+    return {
+        "page": page,
+        "size": size,
+        "total": total,
+        "items": items,
+        "next_cursor": next_cursor,
+    }
 
 
 @router.get(
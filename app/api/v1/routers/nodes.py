@@ -11,7 +11,7 @@ from app.api.v1.schemas.nodes import (
     NodesPage,
     NodeUpdate,
 )
-from app.api.v1.utils import extract_metadata_filters
+from app.api.v1.utils import decode_node_cursor, encode_cursor, extract_metadata_filters
 from app.app.services import (
     DocumentNotFoundError,
     InvalidNodeOperationError,
@@ -257,14 +257,28 @@ def list_nodes(
     size: int = Query(default=20, ge=1, le=100),
     include_deleted: bool = False,
     type: str | None = None,
+    cursor: str | None = Query(default=None),
     db: Session = Depends(get_db),
 ):
     services = get_service_bundle(db)
     node_service = services.node()
     items, total = node_service.list_nodes(
-        page=page, size=size, include_deleted=include_deleted, node_type=type
+        page=page,
+        size=size,
+        include_deleted=include_deleted,
+        node_type=type,
+        cursor=decode_node_cursor(cursor) if cursor else None,
     )
-    return {"page": page, "size": size, "total": total, "items": items}
+    next_cursor = None
+    if len(items) == size:
+        next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+    return {
+        "page": page,
+        "size": size,
+        "total": total,
+        "items": items,
+        "next_cursor": next_cursor,
+    }
 
 
 @router.post("/nodes/reorder", response_model=list[NodeOut])
@@ -46,8 +46,10 @@ class DocumentOut(BaseModel):
 class DocumentsPage(BaseModel):
     page: int
     size: int
-    total: int
+    # 使用 cursor 翻页时不统计总数，total 为 null
+    total: int | None = None
     items: list[DocumentOut]
+    next_cursor: str | None = None
 
 
 class DocumentBindingOut(BaseModel):
@@ -61,8 +61,10 @@ class NodeOut(BaseModel):
 class NodesPage(BaseModel):
     page: int
     size: int
-    total: int
+    # 使用 cursor 翻页时不统计总数，total 为 null
+    total: int | None = None
     items: list[NodeOut]
+    next_cursor: str | None = None
 
 
 class NodeReorderPayload(BaseModel):
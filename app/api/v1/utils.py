@@ -1,6 +1,10 @@
+import base64
+import binascii
+import json
 from collections import defaultdict
+from datetime import datetime
 from decimal import Decimal, InvalidOperation
-from typing import DefaultDict
+from typing import Any, DefaultDict
 
 from fastapi import HTTPException, status
 from starlette.requests import Request
@@ -77,3 +81,49 @@ def _validate_numeric(value: str, field: str) -> None:
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Metadata field '{field}' expects a numeric value for range filters",
         ) from exc
+
+
+def encode_cursor(*values: Any) -> str:
+    """将 keyset 分页的排序键编码为不透明的 URL 安全字符串。"""
+
+    encoded = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(encoded, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> list[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError) as exc:
+        raise _invalid_cursor() from exc
+    if not isinstance(values, list) or len(values) != 2:
+        raise _invalid_cursor()
+    return values
+
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor"
+    )
+
+
+def decode_document_cursor(cursor: str) -> tuple[int, int]:
+    """解析文档列表游标，返回 ``(position, id)``。"""
+
+    position, doc_id = _decode_cursor(cursor)
+    if not isinstance(position, int) or not isinstance(doc_id, int):
+        raise _invalid_cursor()
+    return position, doc_id
+
+
+def decode_node_cursor(cursor: str) -> tuple[datetime, int]:
+    """解析节点列表游标，返回 ``(created_at, id)``。"""
+
+    created_at, node_id = _decode_cursor(cursor)
+    if not isinstance(created_at, str) or not isinstance(node_id, int):
+        raise _invalid_cursor()
+    try:
+        return datetime.fromisoformat(created_at), node_id
+    except ValueError as exc:
+        raise _invalid_cursor() from exc
@@ -290,17 +290,18 @@ class AssetService(BaseService):
             )
 
         expires_in = int(self._settings.STORAGE_PRESIGN_EXPIRES_SECONDS)
-        urls: list[AssetPartUrl] = []
-
-        for part_number in unique_parts:
-            url = self._storage.presign_upload_part(
-                bucket=asset.bucket,
-                object_key=asset.object_key,
-                upload_id=str(upload_id),
-                part_number=int(part_number),
-                expires_in=expires_in,
-            )
-            urls.append(AssetPartUrl(part_number=int(part_number), url=url))
+        part_ints = [int(part_number) for part_number in unique_parts]
+        signed = self._storage.presign_upload_parts(
+            bucket=asset.bucket,
+            object_key=asset.object_key,
+            upload_id=str(upload_id),
+            part_numbers=part_ints,
+            expires_in=expires_in,
+        )
+        urls = [
+            AssetPartUrl(part_number=part_number, url=url)
+            for part_number, url in zip(part_ints, signed)
+        ]
 
         return str(upload_id), urls
 
@@ -5,6 +5,8 @@ from typing import Generator, Iterable
 
 from sqlalchemy.orm import Session
 
+from app.domain.repositories.count_cache import invalidate_counts
+
 
 class ServiceError(Exception):
     """Base class for application service level exceptions."""
@@ -39,6 +41,8 @@ class BaseService:
         except Exception:
             self._session.rollback()
             raise
+        # 写入可能改变列表总数，提交后丢弃缓存的 COUNT
+        invalidate_counts()
 
     def _refresh_many(self, instances: Iterable[object]) -> None:
         for instance in instances:
@@ -49,3 +53,4 @@ class BaseService:
         """Provide an explicit transaction boundary for composed use cases."""
         with self._session.begin():
             yield self._session
+        invalidate_counts()
@@ -21,7 +21,7 @@ from .node_service import NodeService
 from .relationship_service import RelationshipService
 
 
-@dataclass
+@dataclass(slots=True)
 class ServiceBundle:
     """Lazily constructs application services sharing the same session."""
 
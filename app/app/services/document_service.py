@@ -4,7 +4,7 @@ from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any, Optional, Sequence
 
-from sqlalchemy import delete, select
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.app.services.base import BaseService
@@ -26,7 +26,7 @@ class InvalidDocumentOperationError(Exception):
     """Raised when a document operation payload is invalid."""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DocumentCreateData:
     title: str
     metadata: Optional[dict[str, Any]] = None
@@ -35,7 +35,7 @@ class DocumentCreateData:
     position: Optional[int] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DocumentUpdateData:
     title: Optional[str] = None
     metadata: Optional[dict[str, Any]] = None
@@ -44,7 +44,7 @@ class DocumentUpdateData:
     position: Optional[int] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DocumentReorderData:
     ordered_ids: tuple[int, ...]
     doc_type: Optional[str] = None
@@ -72,6 +72,8 @@ class DocumentService(BaseService):
         position = data.position
         if position is None:
             position = self._repo.next_position(data.type)
+        else:
+            self._repo.reserve_position(data.type, position)
         document = Document(
             title=data.title,
             metadata_=payload,
@@ -121,6 +123,8 @@ class DocumentService(BaseService):
             document.type = data.type
         if data.position is not None:
             document.position = int(data.position)
+        if data.type is not None or data.position is not None:
+            self._repo.reserve_position(document.type, document.position)
         document.updated_by = user
         self.session.flush()
         snapshot = self._versions.build_snapshot_from_document(document)
@@ -190,7 +194,8 @@ class DocumentService(BaseService):
         search_query: str | None = None,
         doc_type: str | None = None,
         doc_ids: Sequence[int] | None = None,
-    ) -> tuple[list[Document], int]:
+        cursor: tuple[int, int] | None = None,
+    ) -> tuple[list[Document], int | None]:
         return self._repo.paginate_documents(
             page,
             size,
@@ -199,6 +204,7 @@ class DocumentService(BaseService):
             search_query=search_query,
             doc_type=doc_type,
             doc_ids=doc_ids,
+            cursor=cursor,
         )
 
     def list_deleted_documents(
@@ -210,7 +216,7 @@ class DocumentService(BaseService):
         search_query: str | None = None,
         doc_type: str | None = None,
         doc_ids: Sequence[int] | None = None,
-    ) -> tuple[list[Document], int]:
+    ) -> tuple[list[Document], int | None]:
         return self._repo.paginate_documents(
             page,
             size,
@@ -256,10 +262,14 @@ class DocumentService(BaseService):
 
         self._repo.lock_documents(doc.id for doc in sequence)
 
+        max_positions: dict[str | None, int] = {}
         for index, document in enumerate(sequence):
             if document.position != index:
                 document.position = index
                 document.updated_by = user
+            max_positions[document.type] = index
+        for doc_type, position in max_positions.items():
+            self._repo.reserve_position(doc_type, position)
 
         self._commit()
         return sequence
@@ -295,9 +305,7 @@ class DocumentService(BaseService):
                 "Document must be soft-deleted before permanent removal"
             )
 
-        self.session.execute(
-            delete(NodeDocument).where(NodeDocument.document_id == document_id)
-        )
+        # 关联行与版本快照由外键 ON DELETE CASCADE 一并删除
         self.session.delete(document)
         self._commit()
 
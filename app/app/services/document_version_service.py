@@ -10,7 +10,7 @@ from app.domain.repositories import DocumentVersionRepository
 from app.infra.db.models import Document, DocumentVersion
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DocumentSnapshot:
     document_id: int
     title: str
@@ -60,7 +60,7 @@ class DocumentVersionService(BaseService):
         change_summary: dict[str, Any] | None = None,
     ) -> DocumentVersion:
         user = self._ensure_user(user_id)
-        next_version = self._next_version_number(snapshot.document_id)
+        next_version = self._repo.next_version_number(snapshot.document_id)
         version = DocumentVersion(
             document_id=snapshot.document_id,
             version_number=next_version,
@@ -154,14 +154,3 @@ class DocumentVersionService(BaseService):
         if changed:
             result["changed"] = changed
         return result
-
-    def _next_version_number(self, document_id: int) -> int:
-        latest = self._repo.get_latest_version_number(document_id) or 0
-        pending_numbers = [
-            obj.version_number
-            for obj in self.session.new
-            if isinstance(obj, DocumentVersion) and obj.document_id == document_id
-        ]
-        if pending_numbers:
-            latest = max(latest, max(pending_numbers))
-        return latest + 1
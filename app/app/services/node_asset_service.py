@@ -168,15 +168,15 @@ class NodeAssetService(BaseService):
             AssetNotFoundError: If the asset doesn't exist.
         """
         self._require_active_asset(asset_id)
-        rows = self._relationships.list_nodes_for_asset(asset_id)
+        rows = self._relationships.list_node_summaries_for_asset(asset_id)
         return [
             AssetBinding(
-                node_id=node.id,
-                node_name=node.name,
-                node_path=node.path,
-                created_at=relation.created_at,
+                node_id=node_id,
+                node_name=node_name,
+                node_path=node_path,
+                created_at=created_at,
             )
-            for relation, node in rows
+            for node_id, node_name, node_path, created_at in rows
         ]
 
     def batch_bind(
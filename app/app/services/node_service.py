@@ -5,7 +5,6 @@ from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Optional, Sequence
 
-from sqlalchemy import delete
 from sqlalchemy.orm import Session
 
 from app.app.services.base import BaseService
@@ -36,7 +35,7 @@ class InvalidNodeOperationError(Exception):
     """Raised when a requested node operation is invalid (e.g., cyclic move)."""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NodeCreateData:
     name: str
     slug: str
@@ -44,7 +43,7 @@ class NodeCreateData:
     type: Optional[str] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NodeUpdateData:
     name: Optional[str] = None
     slug: Optional[str] = None
@@ -53,7 +52,7 @@ class NodeUpdateData:
     type: Optional[str] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NodeReorderData:
     parent_id: Optional[int]
     ordered_ids: tuple[int, ...]
@@ -238,7 +237,9 @@ class NodeService(BaseService):
 
         if path_changed:
             old_path = node.path
-            descendants = self._repo.fetch_descendants(old_path, exclude_id=node.id)
+            descendants = list(
+                self._repo.fetch_descendants(old_path, exclude_id=node.id)
+            )
             node.path = new_path
             prefix = f"{old_path}."
             for descendant in descendants:
@@ -377,10 +378,8 @@ class NodeService(BaseService):
             nodes_to_remove.add(descendant.id)
             node_map.setdefault(descendant.id, descendant)
 
+        # 文档与资源的绑定行由外键 ON DELETE CASCADE 一并删除
         if nodes_to_remove:
-            self.session.execute(
-                delete(NodeDocument).where(NodeDocument.node_id.in_(nodes_to_remove))
-            )
             for node_id_to_delete in nodes_to_remove:
                 target = node_map.get(node_id_to_delete)
                 if target is None:
@@ -441,8 +440,11 @@ class NodeService(BaseService):
         size: int,
         include_deleted: bool = False,
         node_type: str | None = None,
-    ) -> tuple[list[Node], int]:
-        return self._repo.paginate_nodes(page, size, include_deleted, node_type)
+        cursor: tuple[datetime, int] | None = None,
+    ) -> tuple[list[Node], int | None]:
+        return self._repo.paginate_nodes(
+            page, size, include_deleted, node_type, cursor=cursor
+        )
 
     def list_children(
         self, node_id: int, *, depth: int, node_type: str | None = None
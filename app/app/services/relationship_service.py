@@ -147,15 +147,15 @@ class RelationshipService(BaseService):
 
     def list_bindings_for_document(self, document_id: int) -> List[DocumentBinding]:
         self._require_active_document(document_id)
-        rows = self._relationships.list_nodes_for_document(document_id)
+        rows = self._relationships.list_node_summaries_for_document(document_id)
         return [
             DocumentBinding(
-                node_id=node.id,
-                node_name=node.name,
-                node_path=node.path,
-                created_at=relation.created_at,
+                node_id=node_id,
+                node_name=node_name,
+                node_path=node_path,
+                created_at=created_at,
             )
-            for relation, node in rows
+            for node_id, node_name, node_path, created_at in rows
         ]
 
     def batch_bind(
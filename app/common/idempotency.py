@@ -6,6 +6,7 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Any, Callable
 
+import orjson
 from fastapi import HTTPException, Request, status
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy import select
@@ -14,9 +15,10 @@ from sqlalchemy.orm import Session
 from app.infra.db.models import IdempotencyRecord
 
 DEFAULT_EXPIRATION_HOURS = 24
+_EXPIRATION_DELTA = timedelta(hours=DEFAULT_EXPIRATION_HOURS)
 
 
-@dataclass
+@dataclass(slots=True)
 class IdempotencyResult:
     replay: bool
     status_code: int
@@ -29,7 +31,7 @@ class IdempotencyService:
 
     def _hash_payload(self, request: Request, payload: dict[str, Any]) -> str:
         payload_json = json.dumps(payload, sort_keys=True, separators=(",", ":"))
-        raw = f"{request.method}:{request.url.path}:{payload_json}"
+        raw = f"{request.method}:{request.scope['path']}:{payload_json}"
         return hashlib.sha256(raw.encode("utf-8")).hexdigest()
 
     def handle(
@@ -59,18 +61,19 @@ class IdempotencyService:
             return IdempotencyResult(
                 replay=True,
                 status_code=existing.status_code,
-                response=existing.response_body,
+                response=orjson.loads(existing.response_body),
             )
 
         response = executor()
-        encoded = jsonable_encoder(response)
+        # orjson 原生处理 dict/list/datetime/dataclass，仅 ORM、pydantic 等对象回退到
+        # jsonable_encoder，序列化结果直接以文本落库，不再经过第二次 JSON 编码
+        encoded = orjson.dumps(response, default=jsonable_encoder).decode("utf-8")
         record = IdempotencyRecord(
             key=key,
             request_hash=payload_hash,
             status_code=status_code,
             response_body=encoded,
-            expires_at=datetime.now(tz=timezone.utc)
-            + timedelta(hours=DEFAULT_EXPIRATION_HOURS),
+            expires_at=datetime.now(tz=timezone.utc) + _EXPIRATION_DELTA,
         )
         self.db.add(record)
         self.db.commit()
@@ -7,10 +7,12 @@ handling database queries and persistence operations.
 from __future__ import annotations
 
 from sqlalchemy import func, select
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, raiseload
 
 from app.infra.db.models import Asset
 
+from .count_cache import short_page_total
+
 
 class AssetRepository:
     """Repository for Asset entity database operations."""
@@ -75,10 +77,16 @@ class AssetRepository:
             count_stmt = count_stmt.where(Asset.filename.ilike(pattern))
 
         # Order and paginate
-        base_stmt = base_stmt.order_by(Asset.created_at.desc(), Asset.id.desc())
+        # List responses never touch relationships; fail fast instead of N+1.
+        base_stmt = base_stmt.order_by(
+            Asset.created_at.desc(), Asset.id.desc()
+        ).options(raiseload("*"))
         base_stmt = base_stmt.offset((page - 1) * size).limit(size)
 
         items = list(self._session.execute(base_stmt).scalars())
-        total = self._session.execute(count_stmt).scalar_one()
+        # A short page is the last one, so its total follows from the offset.
+        total = short_page_total(page, size, len(items))
+        if total is None:
+            total = self._session.execute(count_stmt).scalar_one()
 
         return items, total
@@ -0,0 +1,76 @@
+"""分页总数（COUNT）的进程内短时缓存。
+
+列表接口每次翻页都会额外执行一次 COUNT，大表上这条语句往往比 LIMIT 查询本身更慢。
+这里按过滤条件缓存总数若干秒：只有结果至少占满一页（总数可能较大）时才写入缓存，
+小结果集始终实时统计；任何写事务提交后由服务层调用 ``invalidate_counts`` 清空。
+缓存仅在当前进程内有效，多实例部署时其他进程最多滞后一个 TTL。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from typing import Any, Callable
+
+COUNT_CACHE_TTL_SECONDS = 60.0
+COUNT_CACHE_MAX_ENTRIES = 1024
+
+_lock = threading.Lock()
+_entries: dict[str, tuple[float, int]] = {}
+
+
+def _count_key(parts: tuple[Any, ...]) -> str:
+    return hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def short_page_total(page: int, size: int, item_count: int) -> int | None:
+    """本页未占满时总数可直接推算，无需再执行 COUNT。
+
+    越界页（非第一页且为空）无法推算，返回 None。
+    """
+    if item_count >= size or (item_count == 0 and page > 1):
+        return None
+    return (page - 1) * size + item_count
+
+
+def lookup_count(key_parts: tuple[Any, ...]) -> int | None:
+    """返回未过期的缓存总数，未命中时返回 None。"""
+    key = _count_key(key_parts)
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] > time.monotonic():
+            return entry[1]
+        del _entries[key]
+    return None
+
+
+def store_count(key_parts: tuple[Any, ...], value: int, *, cacheable: bool) -> None:
+    """``cacheable`` 为真时写入缓存（通常即本页已占满）。"""
+    if not cacheable:
+        return
+    key = _count_key(key_parts)
+    with _lock:
+        if key not in _entries and len(_entries) >= COUNT_CACHE_MAX_ENTRIES:
+            _entries.pop(next(iter(_entries)))
+        _entries[key] = (time.monotonic() + COUNT_CACHE_TTL_SECONDS, value)
+
+
+def cached_count(
+    key_parts: tuple[Any, ...], compute: Callable[[], int], *, cacheable: bool
+) -> int:
+    """返回缓存的总数；未命中时执行 ``compute``，``cacheable`` 为真才写入缓存。"""
+    cached = lookup_count(key_parts)
+    if cached is not None:
+        return cached
+    value = compute()
+    store_count(key_parts, value, cacheable=cacheable)
+    return value
+
+
+def invalidate_counts() -> None:
+    """清空所有缓存的总数，写操作提交后调用。"""
+    with _lock:
+        _entries.clear()
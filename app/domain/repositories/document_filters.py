@@ -1,17 +1,20 @@
 from __future__ import annotations
 
+import json
+import math
 from dataclasses import dataclass
 from decimal import Decimal, InvalidOperation
-from typing import Sequence
+from typing import Any, Iterable, Sequence
 
-from sqlalchemy import Float, Text, and_, cast, func, or_
+from sqlalchemy import Float, Text, and_, bindparam, cast, func, or_
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import Select
 from sqlalchemy.sql.elements import ColumnElement
 
 from app.infra.db.models import Document
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MetadataFilterClause:
     field: str
     operator: str
@@ -85,18 +88,45 @@ def _build_metadata_condition(
 def _build_array_condition(
     clause: MetadataFilterClause, *, match_all: bool
 ) -> ColumnElement[bool] | None:
-    field_expr = Document.metadata_.op("->")(clause.field)
-    checks = [func.jsonb_exists(field_expr, value) for value in clause.values]
-    if not checks:
+    # 语义与 jsonb_exists(metadata->field, value) 一致，按字段的 JSON 类型拆成三支：
+    # 数组包含元素、字符串等于该值（两支均为 @>，可命中 GIN），对象包含该键
+    if not clause.values:
         return None
-    if len(checks) == 1:
-        return checks[0]
-    combiner = and_ if match_all else or_
-    return combiner(*checks)
+    field = clause.field
+    if match_all:
+        values = list(dict.fromkeys(clause.values))
+        # 单个 `metadata @> {"field": [v1, v2]}` 即可表达“同时包含”，一次 GIN 探测完成
+        checks = [_contains({field: values})]
+        if len(values) == 1:
+            checks.append(_contains({field: values[0]}))
+        checks.append(
+            and_(
+                _object_field(field),
+                *(_object_has_key(field, value) for value in values),
+            )
+        )
+        return or_(*checks)
+    return _or_all(
+        check
+        for value in clause.values
+        for check in (
+            _contains({field: [value]}),
+            _contains({field: value}),
+            and_(_object_field(field), _object_has_key(field, value)),
+        )
+    )
+
+
+def _object_field(field: str) -> ColumnElement[bool]:
+    return func.jsonb_typeof(Document.metadata_.op("->")(field)) == "object"
+
+
+def _object_has_key(field: str, key: str) -> ColumnElement[bool]:
+    return func.jsonb_exists(Document.metadata_.op("->")(field), key)
 
 
 def _build_like_condition(clause: MetadataFilterClause) -> ColumnElement[bool] | None:
-    value_expr = cast(Document.metadata_.op("->>")(clause.field), Text)
+    value_expr = _text_value(clause.field)
     checks = []
     for value in clause.values:
         pattern = value if any(ch in value for ch in ("%", "_")) else f"%{value}%"
@@ -111,7 +141,7 @@ def _build_like_condition(clause: MetadataFilterClause) -> ColumnElement[bool] |
 def _build_not_equals_condition(
     clause: MetadataFilterClause,
 ) -> ColumnElement[bool] | None:
-    value_expr = cast(Document.metadata_.op("->>")(clause.field), Text)
+    value_expr = _text_value(clause.field)
     checks = [value_expr != value for value in clause.values]
     if not checks:
         return None
@@ -124,7 +154,7 @@ def _build_numeric_condition(clause: MetadataFilterClause) -> ColumnElement[bool
     if len(clause.values) != 1:
         raise ValueError("Range operator expects a single comparison value")
     numeric_value = _parse_numeric_value(clause.values[0])
-    numeric_expr = cast(Document.metadata_.op("->>")(clause.field), Float)
+    numeric_expr = cast(_text_value(clause.field), Float)
     match clause.operator:
         case "gt":
             return numeric_expr > numeric_value
@@ -140,17 +170,58 @@ def _build_numeric_condition(clause: MetadataFilterClause) -> ColumnElement[bool
 def _build_equals_condition(
     clause: MetadataFilterClause,
 ) -> ColumnElement[bool] | None:
-    if clause.operator == "in":
-        value_expr = cast(Document.metadata_.op("->>")(clause.field), Text)
-        return value_expr.in_(clause.values)
+    # eq/in 统一改写为 `metadata @> {"field": value}`，可直接命中 metadata 上的 GIN 索引；
+    # 查询参数均为字符串，数字/布尔字面量额外生成一份对应 JSON 标量，保持与 ->> 文本比较一致
+    return _or_all(
+        _scalar_check(clause.field, value, candidate)
+        for value in clause.values
+        for candidate in _scalar_candidates(value)
+    )
 
-    value_expr = cast(Document.metadata_.op("->>")(clause.field), Text)
-    checks = [value_expr == value for value in clause.values]
-    if not checks:
+
+def _scalar_check(field: str, raw: str, candidate: Any) -> ColumnElement[bool]:
+    check = _contains({field: candidate})
+    if isinstance(candidate, bool) or not isinstance(candidate, (int, float)):
+        return check
+    # jsonb 数值按数值相等包含（40 与 40.0 互相命中），而 ->> 保留原始写法（"40.0"）；
+    # @> 负责走 GIN 缩小范围，再以 ->> 文本比较保证逐字匹配
+    return and_(check, _text_value(field) == raw)
+
+
+def _text_value(field: str) -> ColumnElement[str]:
+    # 直接以文本类型声明 `metadata ->> 'field'`，不再外包 CAST：生成的表达式与
+    # 部署侧按热点键建立的 B-tree 表达式索引逐字一致，规划器才能选用该索引
+    return Document.metadata_.op("->>", return_type=Text)(field)
+
+
+def _contains(payload: dict[str, Any]) -> ColumnElement[bool]:
+    return Document.metadata_.op("@>")(cast(bindparam(None, payload, JSONB), JSONB))
+
+
+def _or_all(checks: Iterable[ColumnElement[bool]]) -> ColumnElement[bool] | None:
+    items = list(checks)
+    if not items:
         return None
-    if len(checks) == 1:
-        return checks[0]
-    return or_(*checks)
+    if len(items) == 1:
+        return items[0]
+    return or_(*items)
+
+
+def _scalar_candidates(value: str) -> list[Any]:
+    # 原始字符串之外至多再补一个数字或布尔标量；带首尾空白的值不解析，
+    # 以免 json.loads 的宽松解析让 " 40 " 命中 40
+    candidates: list[Any] = [value]
+    if value != value.strip():
+        return candidates
+    try:
+        parsed = json.loads(value)
+    except ValueError:
+        return candidates
+    if isinstance(parsed, bool) or (
+        isinstance(parsed, (int, float)) and math.isfinite(parsed)
+    ):
+        candidates.append(parsed)
+    return candidates
 
 
 def _parse_numeric_value(value: str) -> float:
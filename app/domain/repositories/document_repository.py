@@ -1,13 +1,49 @@
 from __future__ import annotations
 
-from typing import Iterable, Sequence
+from typing import Any, Iterable, Sequence
 
-from sqlalchemy import func, select, text
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, bindparam, func, literal, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, raiseload
 
-from app.infra.db.models import Document
+from app.infra.db.models import Document, DocumentPosition
 
+from .count_cache import lookup_count, short_page_total, store_count
 from .document_filters import MetadataFilters, apply_document_filters
+from .identity import split_loaded
+
+# 固定形态的查询在导入时构建一次，IN 列表使用 expanding 参数，
+# 避免每次调用重新拼装语句。
+_DOCUMENTS_BY_IDS = (
+    select(Document)
+    .where(Document.id.in_(bindparam("ids", expanding=True)))
+    .order_by(Document.position.asc(), Document.id.asc())
+)
+_ACTIVE_DOCUMENTS_BY_IDS = _DOCUMENTS_BY_IDS.where(Document.deleted_at.is_(None))
+_LOCK_KEYS = text(
+    "SELECT pg_advisory_xact_lock(k) FROM unnest(CAST(:keys AS bigint[])) AS t(k) "
+    "ORDER BY k"
+)
+
+
+def _is_unfiltered(
+    include_deleted: bool,
+    *,
+    deleted_only: bool,
+    metadata_filters: MetadataFilters | None,
+    search_query: str | None,
+    doc_type: str | None,
+    doc_ids: Sequence[int] | None,
+) -> bool:
+    """是否为不带任何附加过滤的活跃文档列表（此时窗口计数需物化整表）。"""
+    return not (
+        include_deleted
+        or deleted_only
+        or metadata_filters
+        or search_query
+        or doc_type is not None
+        or doc_ids
+    )
 
 
 class DocumentRepository:
@@ -18,18 +54,36 @@ class DocumentRepository:
         return self._session.get(Document, document_id)
 
     def next_position(self, doc_type: str | None) -> int:
-        stmt = select(func.max(Document.position))
-        if doc_type is None:
-            stmt = stmt.where(Document.type.is_(None))
-        else:
-            stmt = stmt.where(Document.type == doc_type)
-        max_pos = self._session.execute(stmt).scalar_one_or_none()
-        return 0 if max_pos is None else int(max_pos) + 1
+        """原子地为该类型分配下一个 position（单条 upsert，无需 MAX 扫描）。"""
+        stmt = (
+            pg_insert(DocumentPosition)
+            .values(type_key=doc_type or "", next_pos=1)
+            .on_conflict_do_update(
+                index_elements=[DocumentPosition.type_key],
+                set_={"next_pos": DocumentPosition.next_pos + 1},
+            )
+            .returning(DocumentPosition.next_pos - 1)
+        )
+        return int(self._session.execute(stmt).scalar_one())
 
-    def paginate_documents(
+    def reserve_position(self, doc_type: str | None, position: int) -> None:
+        """显式写入 position 后推进计数器，保证后续新文档仍排在末尾。"""
+        stmt = pg_insert(DocumentPosition).values(
+            type_key=doc_type or "", next_pos=position + 1
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DocumentPosition.type_key],
+            set_={
+                "next_pos": func.greatest(
+                    DocumentPosition.next_pos, stmt.excluded.next_pos
+                )
+            },
+        )
+        self._session.execute(stmt)
+
+    def _apply_list_filters(
         self,
-        page: int,
-        size: int,
+        stmt: Select,
         include_deleted: bool,
         *,
         deleted_only: bool = False,
@@ -37,48 +91,134 @@ class DocumentRepository:
         search_query: str | None = None,
         doc_type: str | None = None,
         doc_ids: Sequence[int] | None = None,
-    ) -> tuple[list[Document], int]:
-        base_stmt = select(Document)
-        count_stmt = select(func.count()).select_from(Document)
+    ) -> Select:
         if deleted_only:
-            base_stmt = base_stmt.where(Document.deleted_at.is_not(None))
-            count_stmt = count_stmt.where(Document.deleted_at.is_not(None))
+            stmt = stmt.where(Document.deleted_at.is_not(None))
         elif not include_deleted:
-            base_stmt = base_stmt.where(Document.deleted_at.is_(None))
-            count_stmt = count_stmt.where(Document.deleted_at.is_(None))
-
-        base_stmt = apply_document_filters(
-            base_stmt,
-            metadata_filters=metadata_filters,
-            search_query=search_query,
-        )
-        count_stmt = apply_document_filters(
-            count_stmt,
+            stmt = stmt.where(Document.deleted_at.is_(None))
+        stmt = apply_document_filters(
+            stmt,
             metadata_filters=metadata_filters,
             search_query=search_query,
         )
         if doc_type is not None:
-            base_stmt = base_stmt.where(Document.type == doc_type)
-            count_stmt = count_stmt.where(Document.type == doc_type)
+            stmt = stmt.where(Document.type == doc_type)
         if doc_ids:
-            base_stmt = base_stmt.where(Document.id.in_(doc_ids))
-            count_stmt = count_stmt.where(Document.id.in_(doc_ids))
-        base_stmt = base_stmt.order_by(Document.position.asc(), Document.id.asc())
+            stmt = stmt.where(Document.id.in_(doc_ids))
+        return stmt
+
+    def paginate_documents(
+        self,
+        page: int,
+        size: int,
+        include_deleted: bool,
+        *,
+        deleted_only: bool = False,
+        metadata_filters: MetadataFilters | None = None,
+        search_query: str | None = None,
+        doc_type: str | None = None,
+        doc_ids: Sequence[int] | None = None,
+        cursor: tuple[int, int] | None = None,
+    ) -> tuple[list[Document], int | None]:
+        """分页查询文档。
+
+        传入 ``cursor``（上一页最后一行的 ``(position, id)``）时走 keyset 分页：
+        以 ``(position, id) > cursor`` 直接在复合索引上定位下一页，忽略 ``page``，
+        且不再执行 COUNT，返回的 total 为 None；需要总数时单独调用
+        ``count_documents``。
+        """
+        filters: dict[str, Any] = {
+            "deleted_only": deleted_only,
+            "metadata_filters": metadata_filters,
+            "search_query": search_query,
+            "doc_type": doc_type,
+            "doc_ids": doc_ids,
+        }
+        base_stmt = self._apply_list_filters(
+            select(Document), include_deleted, **filters
+        )
+        # 列表只序列化列属性：raiseload 让任何关联懒加载立即报错，避免悄悄退化为 N+1
+        base_stmt = base_stmt.order_by(
+            Document.position.asc(), Document.id.asc()
+        ).options(raiseload("*"))
+        if cursor is not None:
+            base_stmt = base_stmt.where(
+                tuple_(Document.position, Document.id) > tuple_(*map(literal, cursor))
+            ).limit(size)
+            return list(self._session.execute(base_stmt).scalars()), None
+
         base_stmt = base_stmt.offset((page - 1) * size).limit(size)
-        items = list(self._session.execute(base_stmt).scalars())
-        total = self._session.execute(count_stmt).scalar_one()
+        count_key = (
+            "documents",
+            include_deleted,
+            deleted_only,
+            tuple(metadata_filters or ()),
+            search_query,
+            doc_type,
+            tuple(doc_ids or ()),
+        )
+        total = lookup_count(count_key)
+        if total is not None or _is_unfiltered(include_deleted, **filters):
+            items = list(self._session.execute(base_stmt).scalars())
+            # 末页未占满时以实际行数为准，避免缓存滞后导致总数与当页不符
+            exact = short_page_total(page, size, len(items))
+            if exact is not None:
+                return items, exact
+            if total is None:
+                # 无过滤时窗口计数要物化整表，改为单独一条（可走仅索引扫描的）COUNT
+                total = self.count_documents(include_deleted)
+                store_count(count_key, total, cacheable=True)
+            return items, total
+
+        # 未命中缓存时用 COUNT(*) OVER () 在同一条语句里带回总数，省去一次往返；
+        # 页码越界取不到行时才回退到单独的 COUNT。
+        rows = self._session.execute(
+            base_stmt.add_columns(func.count().over().label("_total"))
+        ).all()
+        items = [row[0] for row in rows]
+        if rows:
+            total = int(rows[0]._total)
+        else:
+            total = 0 if page == 1 else self.count_documents(include_deleted, **filters)
+        store_count(count_key, total, cacheable=len(items) == size)
         return items, total
 
+    def count_documents(
+        self,
+        include_deleted: bool,
+        *,
+        deleted_only: bool = False,
+        metadata_filters: MetadataFilters | None = None,
+        search_query: str | None = None,
+        doc_type: str | None = None,
+        doc_ids: Sequence[int] | None = None,
+    ) -> int:
+        count_stmt = self._apply_list_filters(
+            select(func.count()).select_from(Document),
+            include_deleted,
+            deleted_only=deleted_only,
+            metadata_filters=metadata_filters,
+            search_query=search_query,
+            doc_type=doc_type,
+            doc_ids=doc_ids,
+        )
+        return int(self._session.execute(count_stmt).scalar_one())
+
     def list_by_ids(
         self, document_ids: Sequence[int], include_deleted: bool = False
     ) -> list[Document]:
         if not document_ids:
             return []
-        stmt = select(Document).where(Document.id.in_(document_ids))
-        if not include_deleted:
-            stmt = stmt.where(Document.deleted_at.is_(None))
-        stmt = stmt.order_by(Document.position.asc(), Document.id.asc())
-        return list(self._session.execute(stmt).scalars())
+        # 已在会话中加载的文档直接复用，只查询缺失的部分
+        loaded, missing = split_loaded(self._session, Document, document_ids)
+        documents = [
+            doc for doc in loaded.values() if include_deleted or doc.deleted_at is None
+        ]
+        if missing:
+            stmt = _DOCUMENTS_BY_IDS if include_deleted else _ACTIVE_DOCUMENTS_BY_IDS
+            documents.extend(self._session.execute(stmt, {"ids": missing}).scalars())
+        documents.sort(key=lambda doc: (doc.position, doc.id))
+        return documents
 
     def fetch_active_for_reorder(
         self,
@@ -99,7 +239,5 @@ class DocumentRepository:
         ids = sorted(set(document_ids))
         if not ids:
             return
-        for doc_id in ids:
-            self._session.execute(
-                text("SELECT pg_advisory_xact_lock(:key)"), {"key": doc_id}
-            )
+        # 一条语句按升序取得全部锁，顺序与逐个加锁一致，避免死锁环
+        self._session.execute(_LOCK_KEYS, {"keys": ids})
@@ -2,10 +2,12 @@ from __future__ import annotations
 
 from typing import Sequence
 
-from sqlalchemy import func, select
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
 
-from app.infra.db.models import DocumentVersion
+from app.infra.db.models import Document, DocumentVersion
 
 
 class DocumentVersionRepository:
@@ -15,6 +17,31 @@ class DocumentVersionRepository:
     def create(self, version: DocumentVersion) -> None:
         self._session.add(version)
 
+    def next_version_number(self, document_id: int) -> int:
+        """原子递增 documents.version_number 并返回新版本号。
+
+        UPDATE 持有文档行锁直到事务结束，同一文档的并发写入按顺序分配版本号；
+        updated_at 保持原值，版本计数不视为文档内容变更。
+        """
+        stmt = (
+            update(Document)
+            .where(Document.id == document_id)
+            .values(
+                version_number=Document.version_number + 1,
+                updated_at=Document.updated_at,
+            )
+            .returning(Document.version_number)
+        )
+        number = int(
+            self._session.execute(
+                stmt, execution_options={"synchronize_session": False}
+            ).scalar_one()
+        )
+        document = self._session.identity_map.get(identity_key(Document, document_id))
+        if document is not None:
+            set_committed_value(document, "version_number", number)
+        return number
+
     def list_by_document(
         self,
         document_id: int,
@@ -22,12 +49,19 @@ class DocumentVersionRepository:
         limit: int,
         offset: int,
     ) -> list[DocumentVersion]:
-        stmt = (
-            select(DocumentVersion)
+        # 先在覆盖索引上定位本页 id（OFFSET 跳过的行不回表），再按 id 取整行
+        page_ids = (
+            select(DocumentVersion.id)
             .where(DocumentVersion.document_id == document_id)
             .order_by(DocumentVersion.version_number.desc())
             .offset(offset)
             .limit(limit)
+            .subquery()
+        )
+        stmt = (
+            select(DocumentVersion)
+            .join(page_ids, DocumentVersion.id == page_ids.c.id)
+            .order_by(DocumentVersion.version_number.desc())
         )
         return list(self._session.execute(stmt).scalars())
 
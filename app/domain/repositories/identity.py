@@ -0,0 +1,30 @@
+"""按主键批量取实体时复用会话 identity map 中已加载的对象。"""
+
+from __future__ import annotations
+
+from typing import Iterable, TypeVar
+
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import instance_state
+from sqlalchemy.orm.util import identity_key
+
+T = TypeVar("T")
+
+
+def split_loaded(
+    session: Session, model: type[T], ids: Iterable[int]
+) -> tuple[dict[int, T], list[int]]:
+    """将主键拆分为已在会话中完整加载的对象与仍需查询的主键。
+
+    已过期（expired）的对象访问属性时会逐个回库，因此视为未命中，
+    交给批量查询统一刷新。
+    """
+    loaded: dict[int, T] = {}
+    missing: list[int] = []
+    for pk in dict.fromkeys(ids):
+        obj = session.identity_map.get(identity_key(model, pk))
+        if obj is None or instance_state(obj).expired_attributes:
+            missing.append(pk)
+        else:
+            loaded[pk] = obj
+    return loaded, missing
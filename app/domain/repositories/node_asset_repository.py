@@ -6,12 +6,24 @@ handling queries for the many-to-many association between nodes and assets.
 
 from __future__ import annotations
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Any, Sequence
+
+from sqlalchemy import Row, Select, select
+from sqlalchemy.orm import QueryableAttribute, Session, selectinload
 
 from app.infra.db.models import Asset, Node, NodeAsset
 
 
+def _with_eager(
+    stmt: Select[Any], eager: Sequence[QueryableAttribute[Any]]
+) -> Select[Any]:
+    """Attach ``selectinload`` options for the requested relationships."""
+    if eager:
+        stmt = stmt.options(*(selectinload(rel) for rel in eager))
+    return stmt
+
+
 class NodeAssetRepository:
     """Repository for NodeAsset relationship database operations."""
 
@@ -62,6 +74,7 @@ class NodeAssetRepository:
         *,
         include_deleted_relations: bool = False,
         include_deleted_nodes: bool = False,
+        eager: Sequence[QueryableAttribute[Any]] = (),
     ) -> list[tuple[NodeAsset, Node]]:
         """List all nodes associated with an asset.
 
@@ -69,6 +82,8 @@ class NodeAssetRepository:
             asset_id: The asset's primary key.
             include_deleted_relations: Include soft-deleted relationships.
             include_deleted_nodes: Include soft-deleted nodes.
+            eager: Relationships to load up front (e.g. ``Node.documents``)
+                so callers touching them do not issue one query per row.
 
         Returns:
             List of (NodeAsset, Node) tuples.
@@ -84,9 +99,43 @@ class NodeAssetRepository:
         if not include_deleted_nodes:
             stmt = stmt.where(Node.deleted_at.is_(None))
 
-        rows = self._session.execute(stmt).all()
+        rows = self._session.execute(_with_eager(stmt, eager)).all()
         return [(row[0], row[1]) for row in rows]
 
+    def list_node_summaries_for_asset(
+        self,
+        asset_id: int,
+        *,
+        include_deleted_relations: bool = False,
+        include_deleted_nodes: bool = False,
+    ) -> list[Row[tuple[int, str, str, datetime]]]:
+        """List the bound nodes of an asset as lightweight rows.
+
+        Only the columns needed to describe a binding are selected, so no
+        ORM entities are built for either side of the relationship.
+
+        Args:
+            asset_id: The asset's primary key.
+            include_deleted_relations: Include soft-deleted relationships.
+            include_deleted_nodes: Include soft-deleted nodes.
+
+        Returns:
+            Rows of (node_id, node_name, node_path, created_at), where
+            created_at is the binding's creation time.
+        """
+        stmt = (
+            select(Node.id, Node.name, Node.path, NodeAsset.created_at)
+            .join(Node, Node.id == NodeAsset.node_id)
+            .where(NodeAsset.asset_id == asset_id)
+            .order_by(Node.path.asc(), Node.id.asc())
+        )
+        if not include_deleted_relations:
+            stmt = stmt.where(NodeAsset.deleted_at.is_(None))
+        if not include_deleted_nodes:
+            stmt = stmt.where(Node.deleted_at.is_(None))
+
+        return list(self._session.execute(stmt).all())
+
     def list_active_node_ids_for_asset(
         self,
         asset_id: int,
@@ -115,7 +164,8 @@ class NodeAssetRepository:
         if not include_deleted_nodes:
             stmt = stmt.where(Node.deleted_at.is_(None))
 
-        return list(self._session.execute(stmt).scalars())
+        # Plain ID column: run on the connection to skip ORM result processing.
+        return list(self._session.connection().execute(stmt).scalars())
 
     def list_assets_for_node(
         self,
@@ -123,13 +173,18 @@ class NodeAssetRepository:
         *,
         include_deleted_relations: bool = False,
         include_deleted_assets: bool = False,
+        eager: Sequence[QueryableAttribute[Any]] = (),
     ) -> list[Asset]:
         """List all assets associated with a node.
 
+        ``selectinload`` is used rather than ``joinedload`` so that eager
+        one-to-many collections do not multiply the asset rows.
+
         Args:
             node_id: The node's primary key.
             include_deleted_relations: Include soft-deleted relationships.
             include_deleted_assets: Include soft-deleted assets.
+            eager: Relationships to load up front (e.g. ``Asset.nodes``).
 
         Returns:
             List of Asset entities.
@@ -145,4 +200,4 @@ class NodeAssetRepository:
         if not include_deleted_assets:
             stmt = stmt.where(Asset.deleted_at.is_(None))
 
-        return list(self._session.execute(stmt).scalars())
+        return list(self._session.execute(_with_eager(stmt, eager)).scalars())
@@ -1,13 +1,56 @@
 from __future__ import annotations
 
-from typing import Any, Iterable, Sequence
+from datetime import datetime
+from typing import Any, Iterable, Iterator, Sequence
 
-from sqlalchemy import func, or_, select, text, update
+from sqlalchemy import (
+    BigInteger,
+    Integer,
+    Select,
+    bindparam,
+    column,
+    func,
+    literal,
+    literal_column,
+    select,
+    text,
+    tuple_,
+    update,
+    values,
+)
 from sqlalchemy.engine import Dialect
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, raiseload
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app.infra.db.base import utcnow
 from app.infra.db.models import Node
-from app.infra.db.types import as_ltree, make_lquery
+from app.infra.db.types import as_ltree, ltree_param, make_ltree
+
+from .count_cache import cached_count, short_page_total
+
+# 固定形态的查询在导入时构建一次，IN 列表使用 expanding 参数。
+_NODES_BY_IDS = select(Node).where(Node.id.in_(bindparam("ids", expanding=True)))
+_STREAM_BATCH_SIZE = 500
+# 子孙/子级查询统一用 path <@ root 在 GiST 索引上做区间扫描，深度用 nlevel 过滤；
+# 语句预先构建，执行时仅传参。
+_PATH = as_ltree(Node.path)
+_DESCENDANTS = (
+    select(Node)
+    .where(Node.id != bindparam("exclude_id"))
+    .where(_PATH.op("<@")(ltree_param("root")))
+    .where(_PATH != ltree_param("root"))
+)
+_CHILDREN = (
+    select(Node)
+    .where(Node.deleted_at.is_(None))
+    .where(_PATH.op("<@")(ltree_param("root")))
+    .where(func.nlevel(_PATH).between(bindparam("min_level"), bindparam("max_level")))
+    .order_by(Node.parent_id, Node.position, Node.id)
+)
+_LOCK_KEYS = text(
+    "SELECT pg_advisory_xact_lock(k) FROM unnest(CAST(:keys AS bigint[])) AS t(k) "
+    "ORDER BY k"
+)
 
 
 class LtreeNotAvailableError(RuntimeError):
@@ -17,14 +60,19 @@ class LtreeNotAvailableError(RuntimeError):
 class NodeRepository:
     def __init__(self, session: Session):
         self._session = session
+        # 会话绑定的引擎在仓库生命周期内不变，方言与 ltree 检查结果只需计算一次
+        self._dialect_cache: Dialect | None = None
+        self._ltree_ok = False
 
     @property
     def session(self) -> Session:
         return self._session
 
     def _dialect(self) -> Dialect | None:
-        bind = self._session.get_bind()
-        return bind.dialect if bind is not None else None
+        if self._dialect_cache is None:
+            bind = self._session.get_bind()
+            self._dialect_cache = bind.dialect if bind is not None else None
+        return self._dialect_cache
 
     def get(self, node_id: int) -> Node | None:
         return self._session.get(Node, node_id)
@@ -42,11 +90,13 @@ class NodeRepository:
     def has_active_name(
         self, parent_path: str | None, name: str, *, exclude_id: int | None = None
     ) -> bool:
-        stmt = select(Node.id).where(Node.deleted_at.is_(None), Node.name == name)
-        if parent_path is None:
-            stmt = stmt.where(Node.parent_path.is_(None))
-        else:
-            stmt = stmt.where(Node.parent_path == parent_path)
+        # 与唯一索引 uq_nodes_parent_name_active 的表达式逐字一致，等值探测直接走该索引
+        stmt = select(Node.id).where(
+            Node.deleted_at.is_(None),
+            func.coalesce(Node.parent_path, literal_column("''"))
+            == (parent_path or ""),
+            Node.name == name,
+        )
         if exclude_id is not None:
             stmt = stmt.where(Node.id != exclude_id)
         return self._session.execute(stmt).scalar_one_or_none() is not None
@@ -82,90 +132,143 @@ class NodeRepository:
         ids = list(dict.fromkeys(node_ids))
         if not ids:
             return []
-        stmt = select(Node).where(Node.id.in_(ids))
-        nodes = {node.id: node for node in self._session.execute(stmt).scalars()}
+        rows = self._session.execute(_NODES_BY_IDS, {"ids": ids}).scalars()
+        nodes = {node.id: node for node in rows}
         return [nodes[node_id] for node_id in ids if node_id in nodes]
 
     def normalize_positions(
         self, parent_id: int | None, *, include_deleted: bool = False
     ) -> None:
-        siblings = list(
-            self.fetch_siblings(
-                parent_id,
-                include_deleted=include_deleted,
-                order_by_position=True,
-            )
+        """将同级节点的 position 重排为 0..n-1。
+
+        先 flush 让待写入的父节点/删除标记参与排序，再用一条
+        ``UPDATE ... FROM (VALUES ...)`` 写回所有变动，避免逐行 UPDATE；
+        随后把新值（含同一时刻的 updated_at）同步到会话中的对象，
+        不产生额外的脏数据，也无需回库刷新。
+        """
+        self._session.flush()
+        siblings = self.fetch_siblings(
+            parent_id,
+            include_deleted=include_deleted,
+            order_by_position=True,
         )
-        for index, node in enumerate(siblings):
-            if node.position != index:
-                node.position = index
+        changed = [
+            (node, index)
+            for index, node in enumerate(siblings)
+            if node.position != index
+        ]
+        if not changed:
+            return
+        new_positions = values(
+            column("id", BigInteger), column("position", Integer), name="new_positions"
+        ).data([(node.id, index) for node, index in changed])
+        now = utcnow()
+        self._session.execute(
+            update(Node)
+            .where(Node.id == new_positions.c.id)
+            .values(position=new_positions.c.position, updated_at=now),
+            execution_options={"synchronize_session": False},
+        )
+        for node, index in changed:
+            set_committed_value(node, "position", index)
+            set_committed_value(node, "updated_at", now)
 
     def require_ltree(self) -> None:
+        if self._ltree_ok:
+            return
         dialect = self._dialect()
         if dialect is None or dialect.name != "postgresql":
             raise LtreeNotAvailableError("PostgreSQL with ltree extension is required")
+        self._ltree_ok = True
 
     def lock_nodes(self, node_ids: Iterable[int]) -> None:
         ids = sorted(set(node_ids))
         if not ids:
             return
-        for node_id in ids:
-            self._session.execute(
-                text("SELECT pg_advisory_xact_lock(:key)"), {"key": node_id}
-            )
+        # 一条语句按升序取得全部锁，顺序与逐个加锁一致，避免死锁环
+        self._session.execute(_LOCK_KEYS, {"keys": ids})
 
-    def fetch_descendants(self, root_path: str, *, exclude_id: int) -> Sequence[Node]:
-        pattern = f"{root_path}.*{{1,}}"
-        path_expr = as_ltree(Node.path)
-        stmt = (
-            select(Node)
-            .where(Node.id != exclude_id)
-            .where(path_expr.op("~")(make_lquery(pattern)))
-        )
-        return tuple(self._session.execute(stmt).scalars())
+    def _stream(
+        self, stmt: Select, params: dict[str, Any] | None = None
+    ) -> Iterator[Node]:
+        # 子树可能很大：按批（服务端游标）逐步产出 ORM 对象，而不是一次性物化。
+        # 调用方需要多次遍历时自行 list()。
+        result = self._session.execute(stmt, params)
+        return iter(result.scalars().yield_per(_STREAM_BATCH_SIZE))
 
-    def fetch_children(self, node_path: str, depth: int) -> Sequence[Node]:
-        pattern = f"{node_path}.*{{1,{depth}}}"
-        path_expr = as_ltree(Node.path)
-        stmt = (
-            select(Node)
-            .where(Node.deleted_at.is_(None))
-            .where(path_expr.op("~")(make_lquery(pattern)))
-            .order_by(Node.parent_id, Node.position, Node.id)
-        )
-        return tuple(self._session.execute(stmt).scalars())
+    def fetch_descendants(self, root_path: str, *, exclude_id: int) -> Iterator[Node]:
+        return self._stream(_DESCENDANTS, {"root": root_path, "exclude_id": exclude_id})
 
-    def fetch_subtree(self, root_path: str, *, include_deleted: bool) -> Sequence[Node]:
-        pattern = f"{root_path}.*{{1,}}"
+    def fetch_children(self, node_path: str, depth: int) -> Iterator[Node]:
+        level = node_path.count(".") + 1
+        params = {"root": node_path, "min_level": level + 1, "max_level": level + depth}
+        return self._stream(_CHILDREN, params)
+
+    def fetch_subtree(self, root_path: str, *, include_deleted: bool) -> Iterator[Node]:
+        """返回根节点及其全部后代（不保证顺序）。
+
+        ``path <@ root`` 同时匹配根与后代，可直接走 GiST 索引；
+        调用方只收集 ID 或逐个删除，因此不再按 ltree 排序。
+        """
         path_expr = as_ltree(Node.path)
-        stmt = select(Node).where(
-            or_(Node.path == root_path, path_expr.op("~")(make_lquery(pattern)))
-        )
+        stmt = select(Node).where(path_expr.op("<@")(make_ltree(root_path)))
         if not include_deleted:
             stmt = stmt.where(Node.deleted_at.is_(None))
-        stmt = stmt.order_by(Node.path)
-        return tuple(self._session.execute(stmt).scalars())
+        return self._stream(stmt)
 
-    def paginate_nodes(
-        self, page: int, size: int, include_deleted: bool, node_type: str | None = None
-    ) -> tuple[list[Node], int]:
-        base_stmt = select(Node)
-        count_stmt = select(func.count()).select_from(Node)
+    def _apply_list_filters(
+        self, stmt: Select, include_deleted: bool, node_type: str | None
+    ) -> Select:
         if not include_deleted:
-            base_stmt = base_stmt.where(Node.deleted_at.is_(None))
-            count_stmt = count_stmt.where(Node.deleted_at.is_(None))
+            stmt = stmt.where(Node.deleted_at.is_(None))
         if node_type is not None:
-            base_stmt = base_stmt.where(Node.type == node_type)
-            count_stmt = count_stmt.where(Node.type == node_type)
-        base_stmt = (
-            base_stmt.order_by(Node.created_at.desc())
-            .offset((page - 1) * size)
-            .limit(size)
+            stmt = stmt.where(Node.type == node_type)
+        return stmt
+
+    def paginate_nodes(
+        self,
+        page: int,
+        size: int,
+        include_deleted: bool,
+        node_type: str | None = None,
+        *,
+        cursor: tuple[datetime, int] | None = None,
+    ) -> tuple[list[Node], int | None]:
+        """按创建时间倒序分页查询节点。
+
+        传入 ``cursor``（上一页最后一行的 ``(created_at, id)``）时走 keyset 分页，
+        以 ``(created_at, id) < cursor`` 定位下一页，忽略 ``page`` 且不执行 COUNT，
+        返回的 total 为 None；需要总数时单独调用 ``count_nodes``。
+        """
+        base_stmt = self._apply_list_filters(select(Node), include_deleted, node_type)
+        base_stmt = base_stmt.order_by(Node.created_at.desc(), Node.id.desc()).options(
+            raiseload("*")
         )
+        if cursor is not None:
+            base_stmt = base_stmt.where(
+                tuple_(Node.created_at, Node.id) < tuple_(*map(literal, cursor))
+            ).limit(size)
+            return list(self._session.execute(base_stmt).scalars()), None
+
+        base_stmt = base_stmt.offset((page - 1) * size).limit(size)
         items = list(self._session.execute(base_stmt).scalars())
-        total = self._session.execute(count_stmt).scalar_one()
+        # 末页未占满时总数可直接推算，跳过 COUNT
+        total = short_page_total(page, size, len(items))
+        if total is not None:
+            return items, total
+        total = cached_count(
+            ("nodes", include_deleted, node_type),
+            lambda: self.count_nodes(include_deleted, node_type),
+            cacheable=len(items) == size,
+        )
         return items, total
 
+    def count_nodes(self, include_deleted: bool, node_type: str | None = None) -> int:
+        count_stmt = self._apply_list_filters(
+            select(func.count()).select_from(Node), include_deleted, node_type
+        )
+        return int(self._session.execute(count_stmt).scalar_one())
+
     def get_ancestor_ids(self, node_path: str) -> list[int]:
         """获取节点的所有祖先 ID 列表（包含自身）。
 
@@ -181,7 +284,8 @@ class NodeRepository:
             .where(Node.path.in_(ancestor_paths))
             .where(Node.deleted_at.is_(None))
         )
-        return list(self._session.execute(stmt).scalars())
+        # 只取 ID 列，直接在连接上执行，跳过 ORM 结果处理
+        return list(self._session.connection().execute(stmt).scalars())
 
     def update_subtree_counts(self, node_ids: Sequence[int], delta: int) -> int:
         """批量更新节点的子树文档计数。
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-from typing import Optional, Sequence
+from datetime import datetime
+from typing import Any, Optional, Sequence
 
-from sqlalchemy import func, select
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, Select, func, select
+from sqlalchemy.orm import Session, raiseload
 
 from app.infra.db.models import Document, Node, NodeDocument
 
+from .count_cache import lookup_count, short_page_total, store_count
 from .document_filters import MetadataFilters, apply_document_filters
 
 
@@ -57,6 +59,26 @@ class RelationshipRepository:
         rows = self._session.execute(stmt).all()
         return [(row[0], row[1]) for row in rows]
 
+    def list_node_summaries_for_document(
+        self,
+        document_id: int,
+        *,
+        include_deleted_relations: bool = False,
+        include_deleted_nodes: bool = False,
+    ) -> list[Row[tuple[int, str, str, datetime]]]:
+        """只查询描述绑定所需的列：(node_id, node_name, node_path, 绑定创建时间)。"""
+        stmt = (
+            select(Node.id, Node.name, Node.path, NodeDocument.created_at)
+            .join(Node, Node.id == NodeDocument.node_id)
+            .where(NodeDocument.document_id == document_id)
+            .order_by(Node.path.asc(), Node.id.asc())
+        )
+        if not include_deleted_relations:
+            stmt = stmt.where(NodeDocument.deleted_at.is_(None))
+        if not include_deleted_nodes:
+            stmt = stmt.where(Node.deleted_at.is_(None))
+        return list(self._session.execute(stmt).all())
+
     def list_active_node_ids_for_document(
         self,
         document_id: int,
@@ -74,41 +96,66 @@ class RelationshipRepository:
         if not include_deleted_nodes:
             stmt = stmt.where(Node.deleted_at.is_(None))
         stmt = stmt.order_by(NodeDocument.node_id.asc())
-        return list(self._session.execute(stmt).scalars())
+        # 只取 ID 列，直接在连接上执行，跳过 ORM 结果处理
+        return list(self._session.connection().execute(stmt).scalars())
 
-    def list_documents_for_nodes(
+    def _documents_for_nodes_stmt(
         self,
+        stmt: Select,
         node_ids: Sequence[int],
         *,
-        include_deleted_relations: bool = False,
-        include_deleted_documents: bool = False,
-        metadata_filters: MetadataFilters | None = None,
-        search_query: str | None = None,
-        doc_type: str | None = None,
-        doc_ids: Sequence[int] | None = None,
-    ) -> list[Document]:
-        if not node_ids:
-            return []
-        stmt = (
-            select(Document)
-            .join(NodeDocument, NodeDocument.document_id == Document.id)
+        include_deleted_relations: bool,
+        include_deleted_documents: bool,
+        metadata_filters: MetadataFilters | None,
+        search_query: str | None,
+        doc_type: str | None,
+        doc_ids: Sequence[int] | None,
+    ) -> Select:
+        # 用 EXISTS 半连接代替 JOIN + DISTINCT：文档绑定多个节点时
+        # 不会产生重复行，也无需对整个连接结果排序/哈希去重。
+        binding = (
+            select(NodeDocument.document_id)
+            .where(NodeDocument.document_id == Document.id)
             .where(NodeDocument.node_id.in_(node_ids))
-            .distinct()
-            .order_by(Document.position.asc(), Document.id.asc())
         )
         if not include_deleted_relations:
-            stmt = stmt.where(NodeDocument.deleted_at.is_(None))
+            binding = binding.where(NodeDocument.deleted_at.is_(None))
+        stmt = stmt.where(binding.exists())
         if not include_deleted_documents:
             stmt = stmt.where(Document.deleted_at.is_(None))
         if doc_type is not None:
             stmt = stmt.where(Document.type == doc_type)
         if doc_ids:
             stmt = stmt.where(Document.id.in_(doc_ids))
-        stmt = apply_document_filters(
+        return apply_document_filters(
             stmt,
             metadata_filters=metadata_filters,
             search_query=search_query,
         )
+
+    def list_documents_for_nodes(
+        self,
+        node_ids: Sequence[int],
+        *,
+        include_deleted_relations: bool = False,
+        include_deleted_documents: bool = False,
+        metadata_filters: MetadataFilters | None = None,
+        search_query: str | None = None,
+        doc_type: str | None = None,
+        doc_ids: Sequence[int] | None = None,
+    ) -> list[Document]:
+        if not node_ids:
+            return []
+        stmt = self._documents_for_nodes_stmt(
+            select(Document),
+            node_ids,
+            include_deleted_relations=include_deleted_relations,
+            include_deleted_documents=include_deleted_documents,
+            metadata_filters=metadata_filters,
+            search_query=search_query,
+            doc_type=doc_type,
+            doc_ids=doc_ids,
+        ).order_by(Document.position.asc(), Document.id.asc())
         return list(self._session.execute(stmt).scalars())
 
     def paginate_documents_for_nodes(
@@ -126,52 +173,50 @@ class RelationshipRepository:
     ) -> tuple[list[Document], int]:
         if not node_ids:
             return [], 0
-        # Base count query
-        count_stmt = (
-            select(func.count(func.distinct(Document.id)))
-            .join(NodeDocument, NodeDocument.document_id == Document.id)
-            .where(NodeDocument.node_id.in_(node_ids))
-        )
-        if not include_deleted_relations:
-            count_stmt = count_stmt.where(NodeDocument.deleted_at.is_(None))
-        if not include_deleted_documents:
-            count_stmt = count_stmt.where(Document.deleted_at.is_(None))
-        if doc_type is not None:
-            count_stmt = count_stmt.where(Document.type == doc_type)
-        if doc_ids:
-            count_stmt = count_stmt.where(Document.id.in_(doc_ids))
-        count_stmt = apply_document_filters(
-            count_stmt,
-            metadata_filters=metadata_filters,
-            search_query=search_query,
-        )
-        total = self._session.execute(count_stmt).scalar_one()
-
-        # Items query with ordering and pagination
+        filters: dict[str, Any] = {
+            "include_deleted_relations": include_deleted_relations,
+            "include_deleted_documents": include_deleted_documents,
+            "metadata_filters": metadata_filters,
+            "search_query": search_query,
+            "doc_type": doc_type,
+            "doc_ids": doc_ids,
+        }
         items_stmt = (
-            select(Document)
-            .join(NodeDocument, NodeDocument.document_id == Document.id)
-            .where(NodeDocument.node_id.in_(node_ids))
-            .distinct()
+            self._documents_for_nodes_stmt(select(Document), node_ids, **filters)
             .order_by(Document.position.asc(), Document.id.asc())
-        )
-        if not include_deleted_relations:
-            items_stmt = items_stmt.where(NodeDocument.deleted_at.is_(None))
-        if not include_deleted_documents:
-            items_stmt = items_stmt.where(Document.deleted_at.is_(None))
-        if doc_type is not None:
-            items_stmt = items_stmt.where(Document.type == doc_type)
-        if doc_ids:
-            items_stmt = items_stmt.where(Document.id.in_(doc_ids))
-        items_stmt = (
-            apply_document_filters(
-                items_stmt,
-                metadata_filters=metadata_filters,
-                search_query=search_query,
-            )
             .offset((page - 1) * size)
             .limit(size)
+            .options(raiseload("*"))
         )
+        count_key = (
+            "documents_for_nodes",
+            tuple(node_ids),
+            include_deleted_relations,
+            include_deleted_documents,
+            tuple(metadata_filters or ()),
+            search_query,
+            doc_type,
+            tuple(doc_ids or ()),
+        )
+        total = lookup_count(count_key)
+        if total is not None:
+            items = list(self._session.execute(items_stmt).scalars())
+            exact = short_page_total(page, size, len(items))
+            return items, total if exact is None else exact
 
-        items = list(self._session.execute(items_stmt).scalars())
+        # 去重已由 EXISTS 完成，窗口计数即为文档数：未命中缓存时随当页一并取回
+        rows = self._session.execute(
+            items_stmt.add_columns(func.count().over().label("_total"))
+        ).all()
+        items = [row[0] for row in rows]
+        if rows:
+            total = int(rows[0]._total)
+        elif page == 1:
+            total = 0
+        else:
+            count_stmt = self._documents_for_nodes_stmt(
+                select(func.count()).select_from(Document), node_ids, **filters
+            )
+            total = int(self._session.execute(count_stmt).scalar_one())
+        store_count(count_key, total, cacheable=len(items) == size)
         return items, total
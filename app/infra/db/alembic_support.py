@@ -20,10 +20,23 @@ def get_alembic_config() -> Config:
     return config
 
 
+@lru_cache(maxsize=1)
+def _script_directory() -> ScriptDirectory:
+    return ScriptDirectory.from_config(get_alembic_config())
+
+
+# 迁移脚本随部署固定，head 在进程生命周期内不变；/ready 与自检频繁调用，
+# 缓存后不再重复解析 alembic.ini 与遍历 versions 目录。
+@lru_cache(maxsize=1)
 def get_head_revision() -> str | None:
-    config = get_alembic_config()
-    script = ScriptDirectory.from_config(config)
-    return script.get_current_head()
+    return _script_directory().get_current_head()
+
+
+def clear_alembic_cache() -> None:
+    """清空 Alembic 配置、脚本目录与 head 缓存（测试中修改配置或迁移目录时使用）。"""
+    get_head_revision.cache_clear()
+    _script_directory.cache_clear()
+    get_alembic_config.cache_clear()
 
 
 def upgrade_to_head() -> None:
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timezone
 
 from sqlalchemy import DateTime, func
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
@@ -8,12 +8,22 @@ class Base(DeclarativeBase):
     pass
 
 
+def utcnow() -> datetime:
+    """带时区的当前 UTC 时间，作为时间戳列的客户端默认值。"""
+    return datetime.now(timezone.utc)
+
+
 class TimestampMixin:
+    # 时间戳在客户端生成：INSERT/UPDATE 后无需 RETURNING 或回查即可得到取值，
+    # 批量插入也能合并为一条多行 INSERT；server_default 仅保留给绕过 ORM 的写入。
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now()
+        DateTime(timezone=True), default=utcnow, server_default=func.now()
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+        DateTime(timezone=True),
+        default=utcnow,
+        server_default=func.now(),
+        onupdate=utcnow,
     )
     deleted_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True
@@ -6,18 +6,18 @@ from sqlalchemy import (
     BigInteger,
     DateTime,
     ForeignKey,
+    Identity,
     Index,
     Integer,
     String,
     Text,
     func,
-    select,
     text,
 )
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.infra.db.base import Base, TimestampMixin
+from app.infra.db.base import Base, TimestampMixin, utcnow
 from app.infra.db.types import HAS_POSTGRES_LTREE, LtreeType
 
 METADATA_JSON_TYPE = JSON().with_variant(JSONB(), "postgresql")
@@ -35,13 +35,16 @@ class Document(Base, TimestampMixin):
     content : 文档正文内容，序列化为 JSON。
     type : 文档类型（如业务应用、系统内置等），用于区分展示或权限。
     position : 同类型文档内的排序序号，默认为 0。
+    version_number : 最新版本号，随每次写入版本快照递增，无版本时为 0。
     created_by / updated_by : 记录最近一次写入该文档的用户标识。
     created_at / updated_at / deleted_at : 来自 `TimestampMixin`，管理审计与软删。
     """
 
     __tablename__ = "documents"
 
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(
+        BigInteger, Identity(always=False), primary_key=True
+    )
     title: Mapped[str] = mapped_column(Text, nullable=False)
     # SQLAlchemy Declarative 保留了 "metadata" 名称，这里使用 metadata_ 作为属性名，并映射到列名 "metadata"
     metadata_: Mapped[dict[str, Any]] = mapped_column(
@@ -53,24 +56,68 @@ class Document(Base, TimestampMixin):
     # 新增的文档类型与位置字段
     type: Mapped[str | None] = mapped_column(String(32), nullable=True)
     position: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # 最新版本号：写入 DocumentVersion 时原子递增，列表查询无需关联版本表
+    version_number: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
     created_by: Mapped[str] = mapped_column(Text, nullable=False)
     updated_by: Mapped[str] = mapped_column(Text, nullable=False)
 
     __table_args__ = (
-        Index("ix_documents_type", "type"),
-        Index("ix_documents_position", "position"),
-        Index("ix_documents_type_position", "type", "position"),
+        # 查询默认只看未删除行，普通过滤索引也只收录未删除行
+        Index(
+            "ix_documents_type",
+            "type",
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL"),
+        ),
+        # 列表与游标翻页按 (position, id) 排序；单列 position 过滤也由它的前导列满足
+        Index(
+            "ix_documents_position_id_active",
+            "position",
+            "id",
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL"),
+        ),
+        # 元数据过滤只用 @> 包含查询，jsonb_path_ops 体积约为默认 GIN 的一半
+        Index(
+            "ix_documents_metadata_path_ops",
+            "metadata",
+            postgresql_using="gin",
+            postgresql_ops={"metadata": "jsonb_path_ops"},
+        ),
     )
 
-    nodes = relationship("NodeDocument", back_populates="document")
+    # 关联行与版本由外键 ON DELETE CASCADE 删除，删除文档时不再逐条加载子行
+    nodes = relationship(
+        "NodeDocument", back_populates="document", passive_deletes=True
+    )
     versions = relationship(
         "DocumentVersion",
         back_populates="document",
         cascade="all, delete-orphan",
+        passive_deletes=True,
+        # 快照含完整 content，禁止隐式懒加载；版本历史走仓储层的分页查询
+        lazy="raise",
         order_by="DocumentVersion.version_number",
     )
 
 
+class DocumentPosition(Base):
+    """按文档类型分配 position 的计数器。
+
+    字段
+    -------
+    type_key : 文档类型；类型为空的文档使用空字符串。
+    next_pos : 该类型下一篇新文档的 position，只增不减。
+    """
+
+    __tablename__ = "document_positions"
+
+    type_key: Mapped[str] = mapped_column(String(32), primary_key=True)
+    next_pos: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+
 class Node(Base, TimestampMixin):
     """基于 PostgreSQL ltree 维护的树形节点。
 
@@ -95,6 +142,13 @@ class Node(Base, TimestampMixin):
     __table_args__ = (
         # ltree child/ancestor queries rely on gist; fallback to btree when gist is unavailable.
         Index("ix_nodes_path_tree", "path", **_path_index_kwargs),
+        Index(
+            "ix_nodes_path_tree_active",
+            "path",
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL"),
+            **_path_index_kwargs,
+        ),
         Index(
             "uq_nodes_path_active",
             "path",
@@ -110,10 +164,33 @@ class Node(Base, TimestampMixin):
             postgresql_where=text("deleted_at IS NULL"),
             sqlite_where=text("deleted_at IS NULL"),
         ),
-        Index("ix_nodes_type", "type"),
+        Index(
+            "ix_nodes_type",
+            "type",
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL"),
+        ),
+        # 节点列表按 created_at DESC, id DESC 翻页，B-tree 反向扫描即可
+        Index(
+            "ix_nodes_created_at_id_active",
+            "created_at",
+            "id",
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_nodes_parent_position_active",
+            "parent_id",
+            "position",
+            "id",
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL"),
+        ),
     )
 
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(
+        BigInteger, Identity(always=False), primary_key=True
+    )
     name: Mapped[str] = mapped_column(Text, nullable=False)
     slug: Mapped[str] = mapped_column(String(255), nullable=False)
     type: Mapped[str | None] = mapped_column(String(32), nullable=True)
@@ -129,8 +206,10 @@ class Node(Base, TimestampMixin):
     created_by: Mapped[str] = mapped_column(Text, nullable=False)
     updated_by: Mapped[str] = mapped_column(Text, nullable=False)
 
-    documents = relationship("NodeDocument", back_populates="node")
-    assets = relationship("NodeAsset", back_populates="node")
+    documents = relationship(
+        "NodeDocument", back_populates="node", passive_deletes=True
+    )
+    assets = relationship("NodeAsset", back_populates="node", passive_deletes=True)
 
 
 class NodeDocument(Base, TimestampMixin):
@@ -146,10 +225,10 @@ class NodeDocument(Base, TimestampMixin):
     __tablename__ = "node_documents"
 
     node_id: Mapped[int] = mapped_column(
-        BigInteger, ForeignKey("nodes.id"), primary_key=True
+        BigInteger, ForeignKey("nodes.id", ondelete="CASCADE"), primary_key=True
     )
     document_id: Mapped[int] = mapped_column(
-        BigInteger, ForeignKey("documents.id"), primary_key=True
+        BigInteger, ForeignKey("documents.id", ondelete="CASCADE"), primary_key=True
     )
     relation_type: Mapped[str] = mapped_column(
         String(16), nullable=False, default="output"
@@ -172,11 +251,20 @@ class DocumentVersion(Base):
             "version_number",
             unique=True,
         ),
+        # 版本历史按版本号倒序分页：INCLUDE id 让翻页定位可只扫索引，不回表
+        Index(
+            "ix_document_versions_document_version_desc",
+            "document_id",
+            text("version_number DESC"),
+            postgresql_include=["id", "snapshot_title", "created_at"],
+        ),
     )
 
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(
+        BigInteger, Identity(always=False), primary_key=True
+    )
     document_id: Mapped[int] = mapped_column(
-        BigInteger, ForeignKey("documents.id"), nullable=False
+        BigInteger, ForeignKey("documents.id", ondelete="CASCADE"), nullable=False
     )
     version_number: Mapped[int] = mapped_column(Integer, nullable=False)
     operation: Mapped[str] = mapped_column(String(32), nullable=False)
@@ -193,20 +281,15 @@ class DocumentVersion(Base):
     )
     created_by: Mapped[str] = mapped_column(Text, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True),
+        default=utcnow,
+        server_default=func.now(),
+        nullable=False,
     )
 
     document = relationship("Document", back_populates="versions")
 
 
-Document.version_number = column_property(
-    select(func.coalesce(func.max(DocumentVersion.version_number), 0))
-    .where(DocumentVersion.document_id == Document.id)
-    .correlate_except(DocumentVersion)
-    .scalar_subquery()
-)
-
-
 class Asset(Base, TimestampMixin):
     """Object storage file asset metadata.
 
@@ -232,7 +315,9 @@ class Asset(Base, TimestampMixin):
 
     __tablename__ = "assets"
 
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(
+        BigInteger, Identity(always=False), primary_key=True
+    )
     filename: Mapped[str] = mapped_column(Text, nullable=False)
     content_type: Mapped[str | None] = mapped_column(String(255), nullable=True)
     size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
@@ -250,7 +335,12 @@ class Asset(Base, TimestampMixin):
     updated_by: Mapped[str] = mapped_column(Text, nullable=False)
 
     __table_args__ = (
-        Index("ix_assets_status", "status"),
+        Index(
+            "ix_assets_status",
+            "status",
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL"),
+        ),
         Index(
             "uq_assets_object_key_active",
             "object_key",
@@ -258,6 +348,12 @@ class Asset(Base, TimestampMixin):
             postgresql_where=text("deleted_at IS NULL"),
             sqlite_where=text("deleted_at IS NULL"),
         ),
+        Index(
+            "ix_assets_filename_trgm",
+            "filename",
+            postgresql_using="gin",
+            postgresql_ops={"filename": "gin_trgm_ops"},
+        ),
     )
 
     nodes = relationship("NodeAsset", back_populates="asset")
@@ -279,7 +375,7 @@ class NodeAsset(Base, TimestampMixin):
     __tablename__ = "node_assets"
 
     node_id: Mapped[int] = mapped_column(
-        BigInteger, ForeignKey("nodes.id"), primary_key=True
+        BigInteger, ForeignKey("nodes.id", ondelete="CASCADE"), primary_key=True
     )
     asset_id: Mapped[int] = mapped_column(
         BigInteger, ForeignKey("assets.id"), primary_key=True
@@ -299,9 +395,9 @@ class IdempotencyRecord(Base):
     Fields
     -------
     key : Idempotency-Key 原值，用作主键。
-    request_hash : 请求方法 + 路径 + 载荷的哈希值，用于冲突检测。
+    request_hash : 请求方法 + 路径 + 载荷的 SHA-256 十六进制摘要（64 字符），用于冲突检测。
     status_code : 初次执行时返回的 HTTP 状态码。
-    response_body : 原始响应体（JSON 化后保存）。
+    response_body : 原始响应体（orjson 序列化后的 JSON 文本）。
     created_at : 记录创建时间。
     expires_at : 记录过期时间，可用于清理。
     """
@@ -309,12 +405,23 @@ class IdempotencyRecord(Base):
     __tablename__ = "idempotency_records"
 
     key: Mapped[str] = mapped_column(String(255), primary_key=True)
-    request_hash: Mapped[str] = mapped_column(String(128), nullable=False)
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
     status_code: Mapped[int] = mapped_column(Integer, nullable=False)
-    response_body: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
+    response_body: Mapped[str] = mapped_column(Text, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now()
+        DateTime(timezone=True), default=utcnow, server_default=func.now()
     )
     expires_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True
     )
+
+    # 记录仅短期保留，表在迁移中设为 UNLOGGED；expires_at 索引服务于过期清理，
+    # 未设置过期时间的记录不会被清理，无需进入索引
+    __table_args__ = (
+        Index(
+            "ix_idempotency_records_expires_at",
+            "expires_at",
+            postgresql_where=text("expires_at IS NOT NULL"),
+            sqlite_where=text("expires_at IS NOT NULL"),
+        ),
+    )
@@ -1,52 +1,200 @@
 from __future__ import annotations
 
-from typing import Any
+import shlex
+from functools import lru_cache
+from typing import Any, Callable
 
+import asyncpg
+import orjson
 from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import sessionmaker
 
 from app.common.config import get_settings
 
-_engine: Engine | None = None
-_SessionLocal: sessionmaker | None = None
+# psycopg (v3) 驱动下同一语句执行满 N 次后转为服务端预备语句，省去重复解析与规划
+PSYCOPG_PREPARE_THRESHOLD = 5
+# 引擎级编译缓存容量（SQLAlchemy 默认 500）。缓存由引擎持有、所有会话共享；
+# 仓库中的热点语句为模块级常量或取值无关的 ltree 参数，缓存键稳定，按语句形态数放大即可
+QUERY_CACHE_SIZE = 1200
 
 
 def _build_connect_args(db_url: str, timeout: int) -> dict[str, Any]:
-    if db_url.lower().startswith("postgresql"):
-        return {"connect_timeout": timeout}
-    return {}
+    scheme = db_url.split(":", 1)[0].lower()
+    if not scheme.startswith("postgresql"):
+        return {}
+    args: dict[str, Any] = {"connect_timeout": timeout}
+    if scheme == "postgresql+psycopg":
+        args["prepare_threshold"] = PSYCOPG_PREPARE_THRESHOLD
+    return args
 
 
+def _json_dumps(value: Any) -> str:
+    # JSONB 列（content / metadata / 快照）的编解码改用 orjson；
+    # OPT_NON_STR_KEYS 保持与 json.dumps 相同的非字符串键处理
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+
+def _json_dumps_bytes(value: Any) -> bytes:
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _json_serializer(db_url: str) -> Callable[[Any], str | bytes]:
+    # psycopg (v3) 的 JSON dumper 直接接受 bytes，省去一次 decode 再 encode；
+    # psycopg2 与 asyncpg 要求 str
+    if db_url.split(":", 1)[0].lower() == "postgresql+psycopg":
+        return _json_dumps_bytes
+    return _json_dumps
+
+
+@lru_cache(maxsize=1)
 def get_engine() -> Engine:
-    global _engine, _SessionLocal
-    if _engine is None:
-        settings = get_settings()
-        _engine = create_engine(
-            settings.DB_URL,
-            pool_pre_ping=True,
-            future=True,
-            connect_args=_build_connect_args(
-                settings.DB_URL, settings.DB_CONNECT_TIMEOUT
-            ),
-        )
-        _SessionLocal = sessionmaker(
-            bind=_engine, autoflush=False, autocommit=False, expire_on_commit=False
-        )
-    return _engine
+    settings = get_settings()
+    # LIFO 取连接：低峰时多余连接自然闲置回收，热点连接保持活跃
+    return create_engine(
+        settings.DB_URL,
+        pool_pre_ping=True,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_use_lifo=True,
+        query_cache_size=QUERY_CACHE_SIZE,
+        json_serializer=_json_serializer(settings.DB_URL),
+        json_deserializer=orjson.loads,
+        future=True,
+        connect_args=_build_connect_args(settings.DB_URL, settings.DB_CONNECT_TIMEOUT),
+    )
 
 
+@lru_cache(maxsize=1)
 def get_session_factory() -> sessionmaker:
-    global _SessionLocal
-    if _SessionLocal is None:
-        get_engine()
-    assert _SessionLocal is not None
-    return _SessionLocal
+    return sessionmaker(
+        bind=get_engine(), autoflush=False, autocommit=False, expire_on_commit=False
+    )
+
+
+# libpq 连接参数中既不被 asyncpg 识别、也不是服务端 GUC 的项。asyncpg 会把 DSN 中
+# 不认识的参数当作服务端设置发送，保留这些项会导致建连失败；连接超时改由
+# DB_CONNECT_TIMEOUT 控制，其余项对 asyncpg 无对应含义，直接忽略
+_LIBPQ_ONLY_PARAMS = frozenset(
+    {
+        "channel_binding",
+        "connect_timeout",
+        "fallback_application_name",
+        "gssdelegation",
+        "gssencmode",
+        "hostaddr",
+        "keepalives",
+        "keepalives_count",
+        "keepalives_idle",
+        "keepalives_interval",
+        "load_balance_hosts",
+        "replication",
+        "require_auth",
+        "requiressl",
+        "service",
+        "sslcompression",
+        "sslsni",
+        "tcp_user_timeout",
+    }
+)
+# 异步连接池只服务 /ready 探针，固定一个连接，不挤占 DB_POOL_SIZE 之外的连接预算
+ASYNC_POOL_SIZE = 1
+
+
+def _parse_pg_options(options: str) -> dict[str, str]:
+    """把 libpq ``options``（如 ``-c search_path=app -c statement_timeout=5s``）展开为 GUC。"""
+    settings: dict[str, str] = {}
+    tokens = shlex.split(options)
+    for index, token in enumerate(tokens):
+        if token == "-c":
+            continue
+        if token.startswith("-c"):
+            token = token[2:]
+        elif token.startswith("--"):
+            token = token[2:]
+        elif index == 0 or tokens[index - 1] != "-c":
+            continue
+        name, sep, value = token.partition("=")
+        if sep:
+            settings[name.replace("-", "_")] = value
+    return settings
+
+
+def _asyncpg_connect_params(db_url: str) -> tuple[str, dict[str, str]]:
+    """把 DB_URL 转为 asyncpg 的 DSN 与 server_settings。
+
+    sslmode、sslrootcert、target_session_attrs 等交给 asyncpg 自行解析；
+    application_name 等其余参数作为服务端设置发送，``options`` 中的 ``-c k=v`` 展开，
+    非 GUC 的 libpq 专有参数剔除。
+    """
+    url = make_url(db_url)
+    query: dict[str, str | tuple[str, ...]] = {}
+    server_settings: dict[str, str] = {}
+    for key, value in url.query.items():
+        if key in _LIBPQ_ONLY_PARAMS:
+            continue
+        if key == "options":
+            for item in (value,) if isinstance(value, str) else value:
+                server_settings.update(_parse_pg_options(item))
+            continue
+        query[key] = value
+    dsn = url.set(drivername="postgresql", query=query)
+    return dsn.render_as_string(hide_password=False), server_settings
+
+
+@lru_cache(maxsize=1)
+def get_async_engine() -> AsyncEngine:
+    """异步引擎，仅供 /ready 等 async 端点使用；业务路由、脚本与 Alembic 使用同步引擎。"""
+    settings = get_settings()
+    dsn, server_settings = _asyncpg_connect_params(settings.DB_URL)
+    timeout = settings.DB_CONNECT_TIMEOUT
+
+    async def connect() -> Any:
+        return await asyncpg.connect(
+            dsn, timeout=timeout, server_settings=server_settings or None
+        )
+
+    return create_async_engine(
+        "postgresql+asyncpg://",
+        async_creator=connect,
+        pool_pre_ping=True,
+        pool_size=ASYNC_POOL_SIZE,
+        max_overflow=0,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        query_cache_size=QUERY_CACHE_SIZE,
+        json_serializer=_json_dumps,
+        json_deserializer=orjson.loads,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_async_session_factory() -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        bind=get_async_engine(),
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+
+async def dispose_async_engine() -> None:
+    """关闭异步连接池（需在事件循环内调用），随后清空缓存。"""
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
+    get_async_engine.cache_clear()
+    get_async_session_factory.cache_clear()
 
 
 def reset_engine() -> None:
-    global _engine, _SessionLocal
-    if _engine is not None:
-        _engine.dispose()
-    _engine = None
-    _SessionLocal = None
+    # 仅在引擎已创建时释放连接池，避免为了 dispose 反而新建引擎
+    if get_engine.cache_info().currsize:
+        get_engine().dispose()
+    get_engine.cache_clear()
+    get_session_factory.cache_clear()
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import importlib
-import uuid
 from typing import Any, Callable
 
 from sqlalchemy import bindparam, cast
@@ -49,38 +48,40 @@ class _FallbackLquery(
         return lambda value: value
 
 
-def _new_ltree_type() -> Any:
-    if _pg_ltree is not None:
-        return _pg_ltree.LTREE()
-    return _FallbackLtree()
-
-
-def _new_lquery_type() -> Any:
-    if _pg_ltree is not None:
-        return _pg_ltree.LQUERY()
-    return _FallbackLquery()
+# 类型对象无状态，模块级单例即可复用，避免每次构造表达式都新建实例；
+# 回退类型声明了 cache_ok，编译结果同样可进入 SQLAlchemy 的语句缓存。
+_LTREE_TYPE: Any = _pg_ltree.LTREE() if _pg_ltree is not None else _FallbackLtree()
+_LQUERY_TYPE: Any = _pg_ltree.LQUERY() if _pg_ltree is not None else _FallbackLquery()
 
 
 def _make_bind_param(value: str, prefix: str) -> BindParameter[str]:
-    return bindparam(f"{prefix}_{uuid.uuid4().hex}", value)
+    # unique=True 由编译器生成匿名参数名：同一语句中多次使用不会冲突，
+    # 且缓存键与取值无关，SQLAlchemy 可以复用已编译的 SQL。
+    return bindparam(prefix, value, unique=True)
 
 
 def make_lquery(pattern: str) -> Any:
     """Return a SQL expression that casts the given pattern into a lquery literal."""
 
-    return cast(_make_bind_param(pattern, "lquery"), _new_lquery_type())
+    return cast(_make_bind_param(pattern, "lquery"), _LQUERY_TYPE)
 
 
 def make_ltree(value: str) -> Any:
     """Return a SQL expression that casts the given value into a ltree literal."""
 
-    return cast(_make_bind_param(value, "ltree"), _new_ltree_type())
+    return cast(_make_bind_param(value, "ltree"), _LTREE_TYPE)
+
+
+def ltree_param(name: str) -> Any:
+    """Return a named, value-less ltree bind for statements built once and reused."""
+
+    return cast(bindparam(name, type_=String()), _LTREE_TYPE)
 
 
 def as_ltree(expression: Any) -> Any:
     """Cast an arbitrary SQL expression to ltree, relying on the extended type."""
 
-    return cast(expression, _new_ltree_type())
+    return cast(expression, _LTREE_TYPE)
 
 
 HAS_POSTGRES_LTREE = _pg_ltree is not None
@@ -104,7 +105,7 @@ class LtreeType(TypeDecorator):
 
     def load_dialect_impl(self, dialect: Any) -> Any:
         if dialect.name == "postgresql":
-            return dialect.type_descriptor(_new_ltree_type())
+            return dialect.type_descriptor(_LTREE_TYPE)
         return dialect.type_descriptor(String(self._length))
 
     def process_bind_param(self, value: Any, dialect: Any) -> Any:
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from prometheus_client import Counter, Histogram, make_asgi_app
 
 # 低基数标签：使用路由模板（如 /api/v1/nodes/{id}），避免动态 ID 导致高基数
@@ -13,5 +15,17 @@ LATENCY = Histogram(
     ["method", "route"],
 )
 
+
+# 标签组合数量有限，缓存已绑定标签的子指标，省去每个请求在 .labels() 中的加锁与字典查找
+@lru_cache(maxsize=4096)
+def request_counter(method: str, route: str, status: str) -> Counter:
+    return REQUESTS.labels(method, route, status)
+
+
+@lru_cache(maxsize=4096)
+def latency_histogram(method: str, route: str) -> Histogram:
+    return LATENCY.labels(method, route)
+
+
 # /metrics 端点 ASGI 应用
 metrics_app = make_asgi_app()
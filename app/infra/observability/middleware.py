@@ -1,19 +1,30 @@
-import json
+# 每个请求都会经过本中间件的多个 await（receive/send 包装），事件循环开销会被放大；
+# 生产启动命令显式指定 --loop uvloop --http httptools（由 uvicorn[standard] 提供），
+# 避免在缺少 C 扩展时静默回退到 asyncio 默认循环与纯 Python 的 h11 解析。
+import codecs
 import logging
+import re
 import time
 import uuid
-from typing import Any, Awaitable, Callable
+from typing import Any
 
-from fastapi import Request
-from starlette.concurrency import iterate_in_threadpool
-from starlette.middleware.base import BaseHTTPMiddleware
+import orjson
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.common.config import get_settings
-from app.infra.observability.metrics import LATENCY, REQUESTS
+from app.infra.observability.metrics import latency_histogram, request_counter
 
+# 探针与指标抓取路径：请求频繁且无业务含义，不计入指标也不写访问日志，
+# 但响应仍带 X-Request-Id，便于与负载均衡/网关日志关联
+_SKIP_PATHS = frozenset({"/metrics", "/metrics/", "/health", "/ready"})
 
-class MetricsMiddleware(BaseHTTPMiddleware):
-    SENSITIVE_KEYS = {
+# 采样的报文字节数上限与日志中保留的字符数上限
+_MAX_BODY_BYTES = 4096
+_MAX_LOGGED_CHARS = 2048
+
+# 需要脱敏的字段名（小写）；JSON 脱敏与文本回退脱敏共用同一份清单
+SENSITIVE_KEYS = frozenset(
+    {
         "password",
         "passwd",
         "pwd",
@@ -25,212 +36,311 @@ class MetricsMiddleware(BaseHTTPMiddleware):
         "x-api-key",
         "authorization",
     }
+)
+# 长的键名在前，避免 access_token 只匹配到其中的 token
+_SENSITIVE_KEY_ALTERNATION = "|".join(
+    re.escape(key) for key in sorted(SENSITIVE_KEYS, key=len, reverse=True)
+)
+
+# 文本脱敏的正则在模块加载时编译一次，避免每个请求重复编译
+# 截断的 JSON 样本："key": "..." 整段字符串值（含空格与转义），
+# 值在样本末尾被截断时一直遮盖到结尾；非字符串标量遮盖到分隔符为止
+_JSON_MASK_PATTERN = re.compile(
+    rf'(?i)"({_SENSITIVE_KEY_ALTERNATION})"\s*:\s*'
+    r'(?:"(?:[^"\\]|\\.)*(?:"|\\?\Z)|[^\s,}\]]+)'
+)
+# 非 JSON 文本中的 key=value / key: value 片段；以引号开头的值已由上一条处理
+_MASK_PATTERNS = (
+    re.compile(rf'(?i)({_SENSITIVE_KEY_ALTERNATION})"?\s*[:=]\s*(?!["\s])[^\s]+'),
+    re.compile(r"(?i)authorization\s*:\s*bearer\s+[A-Za-z0-9\-_.]+"),
+)
+
+
+_http_logger = logging.getLogger("http")
+_Utf8Decoder = codecs.getincrementaldecoder("utf-8")
+
+
+def _decode_prefix(data: bytes, limit: int) -> tuple[str, bool]:
+    """只解码前 ``limit`` 字节，返回文本及是否发生截断。"""
+    if len(data) <= limit:
+        return data.decode("utf-8", errors="replace"), False
+    # final=False：截断处不完整的多字节序列留在解码器缓冲区，不输出替换字符
+    return _Utf8Decoder(errors="replace").decode(data[:limit], final=False), True
+
+
+def _tee(sample: bytearray, chunk: bytes) -> None:
+    remaining = _MAX_BODY_BYTES + 1 - len(sample)
+    if remaining > 0:
+        sample.extend(chunk[:remaining])
+
+
+_LOG_FIELDS = (
+    "method=%s route=%s status=%s duration_ms=%.3f "
+    "request_id=%s user_id=%s client_ip=%s query=%s user_agent=%s referer=%s"
+)
+_REQUEST_LOG_FORMAT = "request " + _LOG_FIELDS
+_ERROR_LOG_FORMAT = "request_error " + _LOG_FIELDS
+
+# client_fields() 的返回值：query、user_id、client_ip、user_agent、referer
+_ClientFields = tuple[str, str, str | None, str | None, str | None]
+
+
+def _emit_http_log(
+    level: int,
+    *,
+    method: str,
+    route: str,
+    status: int,
+    elapsed: float,
+    request_id: str,
+    fields: _ClientFields,
+    exc: BaseException | None = None,
+    bodies: dict[str, str | None] | None = None,
+) -> None:
+    """成功与异常两条路径共用的访问日志输出；传入 ``exc`` 时附带异常堆栈。"""
+    query, user_id, client_ip, user_agent, referer = fields
+    duration_ms = round(elapsed * 1000, 3)
+    payload: dict[str, Any] = {
+        "method": method,
+        "route": route,
+        "query": query,
+        "status": status,
+        "duration_ms": duration_ms,
+        "request_id": request_id,
+        "user_id": user_id,
+        "client_ip": client_ip,
+        "user_agent": user_agent,
+        "referer": referer,
+    }
+    if exc is not None:
+        payload["exception"] = repr(exc)
+    if bodies:
+        payload.update(bodies)
+    _http_logger.log(
+        level,
+        _ERROR_LOG_FORMAT if exc is not None else _REQUEST_LOG_FORMAT,
+        method,
+        route,
+        status,
+        duration_ms,
+        request_id,
+        user_id,
+        client_ip or "-",
+        query or "-",
+        user_agent or "-",
+        referer or "-",
+        exc_info=exc,
+        extra={"extra": payload},
+    )
+
+
+def _ensure_request_id(message: Message, request_id_bytes: bytes) -> None:
+    """在 ``http.response.start`` 的头列表中补上 X-Request-Id，已存在时不重复添加。"""
+    # 直接操作 ASGI 头列表：一次扫描判断是否已存在，缺失时追加
+    headers = message.get("headers")
+    if not isinstance(headers, list):
+        headers = message["headers"] = list(headers or ())
+    if not any(key.lower() == b"x-request-id" for key, _ in headers):
+        headers.append((b"x-request-id", request_id_bytes))
+
+
+def _mask_json_replacement(match: re.Match[str]) -> str:
+    return f'"{match.group(1)}": "***"'
+
+
+def _mask_replacement(match: re.Match[str]) -> str:
+    return match.group(0).split(":")[0].split("=")[0] + ": ***"
+
+
+class MetricsMiddleware:
+    """纯 ASGI 中间件：记录指标、透传 X-Request-Id 并输出结构化访问日志。
+
+    不继承 BaseHTTPMiddleware：不为每个请求额外创建任务与内存流，也不构造
+    Request/Response 对象，响应体保持流式下发。TRACE_HTTP 开启时只在
+    receive/send 经过时旁路复制请求体与响应体。
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        # 配置在进程内不变，构建中间件时读取一次
+        self._trace_http = get_settings().TRACE_HTTP
 
     def _mask_mapping(self, obj: Any) -> Any:
-        if isinstance(obj, dict):
-            masked: dict[str, Any] = {}
-            for k, v in obj.items():
-                if isinstance(k, str) and k.lower() in self.SENSITIVE_KEYS:
-                    masked[k] = "***"
-                else:
-                    masked[k] = self._mask_mapping(v)
-            return masked
-        if isinstance(obj, list):
-            return [self._mask_mapping(x) for x in obj]
+        # 就地脱敏：obj 为刚解析出的 JSON，归本次调用独占，无需重建容器；
+        # 用显式栈迭代遍历，避免深层结构的递归调用开销
+        stack = [obj]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, dict):
+                for k, v in node.items():
+                    if isinstance(k, str) and k.lower() in SENSITIVE_KEYS:
+                        node[k] = "***"
+                    elif isinstance(v, (dict, list)):
+                        stack.append(v)
+            elif isinstance(node, list):
+                stack.extend(x for x in node if isinstance(x, (dict, list)))
         return obj
 
     def _mask_text(self, text: str) -> str:
         # 简单文本掩码：对形如 token=xxxx 或 Authorization: Bearer xxxx 的片段进行模糊替换
+        masked = _JSON_MASK_PATTERN.sub(_mask_json_replacement, text)
+        for pattern in _MASK_PATTERNS:
+            masked = pattern.sub(_mask_replacement, masked)
+        return masked
+
+    def _format_body(self, raw_body: bytes) -> str | None:
+        if not raw_body:
+            return None
+        # 先截取固定长度的样本再解码与脱敏，处理量与原始报文大小无关；
+        # 截断的 JSON 无法解析，回退到文本脱敏（模式兼容 "key": value 形式）
+        sample = raw_body[:_MAX_BODY_BYTES]
         try:
-            import re
-
-            patterns = [
-                r"(?i)(token|secret|api_key|x-api-key|password|authorization)\s*[:=]\s*[^\s]+",
-                r"(?i)authorization\s*:\s*bearer\s+[A-Za-z0-9\-_.]+",
-            ]
-            masked = text
-            for p in patterns:
-                masked = re.sub(
-                    p,
-                    lambda m: m.group(0).split(":")[0].split("=")[0] + ": ***",
-                    masked,
-                )
-            return masked
-        except Exception:
-            return text
-
-    async def dispatch(
-        self, request: Request, call_next: Callable[[Request], Awaitable[Any]]
-    ) -> Any:
-        start = time.perf_counter()
-        request_id = request.headers.get("X-Request-Id") or str(uuid.uuid4())
-        client = request.client or None
-        client_ip = request.headers.get("X-Forwarded-For")
-        if client_ip:
-            client_ip = client_ip.split(",")[0].strip()
-        elif client:
-            client_ip = client.host
+            parsed = orjson.loads(sample)
+        except orjson.JSONDecodeError:
+            text, truncated = _decode_prefix(sample, _MAX_LOGGED_CHARS)
+            masked_text = self._mask_text(text)
         else:
-            client_ip = None
+            encoded = orjson.dumps(self._mask_mapping(parsed))
+            masked_text, truncated = _decode_prefix(encoded, _MAX_LOGGED_CHARS)
+        truncated = truncated or len(raw_body) > _MAX_BODY_BYTES
+        if len(masked_text) > _MAX_LOGGED_CHARS:
+            masked_text = masked_text[:_MAX_LOGGED_CHARS]
+            truncated = True
+        return masked_text + "...<truncated>" if truncated else masked_text
 
-        trace_http = get_settings().TRACE_HTTP
-        request_body: str | None = None
-        if trace_http:
-            try:
-                raw_body = await request.body()
-                if raw_body:
-                    decoded_body = raw_body.decode("utf-8", errors="replace")
-                    # JSON 尝试脱敏，否则进行基于文本的简易脱敏
-                    try:
-                        parsed = json.loads(decoded_body)
-                    except Exception:
-                        masked_text = self._mask_text(decoded_body)
-                        if len(masked_text) > 2048:
-                            masked_text = masked_text[:2048] + "...<truncated>"
-                        request_body = masked_text
-                    else:
-                        masked_obj = self._mask_mapping(parsed)
-                        masked_text = json.dumps(masked_obj, ensure_ascii=False)
-                        if len(masked_text) > 2048:
-                            masked_text = masked_text[:2048] + "...<truncated>"
-                        request_body = masked_text
-
-                    async def receive() -> dict[str, Any]:
-                        return {
-                            "type": "http.request",
-                            "body": raw_body,
-                            "more_body": False,
-                        }
-
-                    request._receive = receive
-            except Exception:
-                request_body = "<unavailable>"
+    async def _passthrough(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """探针与指标路径：只透传 X-Request-Id，跳过指标、访问日志与报文采样。"""
+        request_id_bytes = next(
+            (value for key, value in scope["headers"] if key == b"x-request-id"),
+            None,
+        ) or uuid.uuid4().hex.encode("latin-1")
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                _ensure_request_id(message, request_id_bytes)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if scope["path"] in _SKIP_PATHS:
+            await self._passthrough(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        # 请求头只转成一次 dict，且只解码实际用到的几个值；ASGI 规范保证头名为小写
+        raw_headers: dict[bytes, bytes] = dict(scope["headers"])
+
+        def header(name: bytes) -> str | None:
+            value = raw_headers.get(name)
+            return value.decode("latin-1") if value is not None else None
+
+        method: str = scope["method"]
+        path: str = scope["path"]
+        # 上游已带 X-Request-Id 时不生成；生成时用 32 位 hex，省去带连字符的格式化
+        request_id = header(b"x-request-id") or uuid.uuid4().hex
+        request_id_bytes = request_id.encode("latin-1")
+
+        def client_fields() -> _ClientFields:
+            """解码只在写日志时才用到的字段：query、user_id、client_ip、UA、referer。"""
+            # 只切出第一个逗号前的字节，不为整条代理链构造列表
+            forwarded = raw_headers.get(b"x-forwarded-for")
+            client_ip: str | None = None
+            if forwarded:
+                comma = forwarded.find(b",")
+                first = forwarded if comma < 0 else forwarded[:comma]
+                client_ip = first.strip().decode("latin-1")
+            if not client_ip and scope.get("client"):
+                client_ip = scope["client"][0]
+            return (
+                scope.get("query_string", b"").decode("latin-1"),
+                header(b"x-user-id") or "<missing>",
+                client_ip,
+                header(b"user-agent"),
+                header(b"referer"),
+            )
+
+        # 日志级别高于 INFO 时访问日志多半被过滤，无需复制与脱敏请求体和响应体
+        capture_bodies = self._trace_http and _http_logger.isEnabledFor(logging.INFO)
+        # 只保留采样所需的前 _MAX_BODY_BYTES + 1 字节（多出的 1 字节用于判断是否截断），
+        # 报文本身照常逐块转发，不做缓冲
+        request_sample = bytearray()
+        response_sample = bytearray()
+        status_code = 500
+
+        async def receive_wrapper() -> Message:
+            message = await receive()
+            if message["type"] == "http.request":
+                _tee(request_sample, message.get("body", b""))
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                _ensure_request_id(message, request_id_bytes)
+            elif message["type"] == "http.response.body" and capture_bodies:
+                _tee(response_sample, message.get("body", b""))
+            await send(message)
 
         try:
-            response = await call_next(request)
-            status_code = response.status_code
+            await self.app(
+                scope, receive_wrapper if capture_bodies else receive, send_wrapper
+            )
         except Exception as exc:
             elapsed = time.perf_counter() - start
-            logger = logging.getLogger("http")
-            user_id = request.headers.get("X-User-Id") or "<missing>"
-            logger.exception(
-                "request_error method=%s route=%s status=%s duration_ms=%.3f "
-                "request_id=%s user_id=%s client_ip=%s query=%s user_agent=%s referer=%s",
-                request.method,
-                request.url.path,
-                500,
-                round(elapsed * 1000, 3),
-                request_id,
-                user_id,
-                client_ip or "-",
-                request.url.query or "-",
-                request.headers.get("User-Agent") or "-",
-                request.headers.get("Referer") or "-",
-                extra={
-                    "extra": {
-                        "method": request.method,
-                        "route": request.url.path,
-                        "query": request.url.query,
-                        "status": 500,
-                        "duration_ms": round(elapsed * 1000, 3),
-                        "request_id": request_id,
-                        "user_id": user_id,
-                        "client_ip": client_ip,
-                        "user_agent": request.headers.get("User-Agent"),
-                        "referer": request.headers.get("Referer"),
-                        "exception": repr(exc),
-                    }
-                },
+            _emit_http_log(
+                logging.ERROR,
+                method=method,
+                route=path,
+                status=500,
+                elapsed=elapsed,
+                request_id=request_id,
+                fields=client_fields(),
+                exc=exc,
             )
             raise
 
         elapsed = time.perf_counter() - start
 
-        route_template = request.scope.get("route", None)
-        if route_template and hasattr(route_template, "path"):
-            route = route_template.path
-        else:
-            route = request.url.path
+        # 路由匹配后 Starlette 会把 route 写回同一个 scope
+        route: str = getattr(scope.get("route"), "path", None) or path
 
-        REQUESTS.labels(request.method, route, str(response.status_code)).inc()
-        LATENCY.labels(request.method, route).observe(elapsed)
-
-        # ensure request-id propagation
-        if "X-Request-Id" not in response.headers:
-            response.headers["X-Request-Id"] = request_id
+        request_counter(method, route, str(status_code)).inc()
+        latency_histogram(method, route).observe(elapsed)
 
         # structured log with correlation id
-        logger = logging.getLogger("http")
-        user_header = request.headers.get("X-User-Id")
-        user_id = user_header or "<missing>"
         level = logging.INFO
         if status_code >= 500:
             level = logging.ERROR
         elif status_code >= 400:
             level = logging.WARNING
+        # 级别被过滤时直接返回，不再构造参数、extra 字典与报文采样
+        if not _http_logger.isEnabledFor(level):
+            return
 
-        duration_ms = round(elapsed * 1000, 3)
-        message = (
-            "request method=%s route=%s status=%s duration_ms=%.3f "
-            "request_id=%s user_id=%s client_ip=%s query=%s user_agent=%s referer=%s"
-        )
-        response_body_str: str | None = None
-        if trace_http:
+        bodies: dict[str, str | None] | None = None
+        if capture_bodies:
+            bodies = {}
             try:
-                response_body_bytes = b""
-                async for chunk in response.body_iterator:
-                    response_body_bytes += chunk
-                response.body_iterator = iterate_in_threadpool(
-                    iter([response_body_bytes])
-                )
-                if response_body_bytes:
-                    decoded_body = response_body_bytes.decode("utf-8", errors="replace")
-                    # JSON 尝试脱敏
-                    try:
-                        parsed = json.loads(decoded_body)
-                    except Exception:
-                        masked_text = self._mask_text(decoded_body)
-                        if len(masked_text) > 2048:
-                            masked_text = masked_text[:2048] + "...<truncated>"
-                        response_body_str = masked_text
-                    else:
-                        masked_obj = self._mask_mapping(parsed)
-                        masked_text = json.dumps(masked_obj, ensure_ascii=False)
-                        if len(masked_text) > 2048:
-                            masked_text = masked_text[:2048] + "...<truncated>"
-                        response_body_str = masked_text
+                bodies["request_body"] = self._format_body(bytes(request_sample))
             except Exception:
-                response_body_str = "<unavailable>"
-
-        extra_payload = {
-            "method": request.method,
-            "route": route,
-            "query": request.url.query,
-            "status": status_code,
-            "duration_ms": duration_ms,
-            "request_id": request_id,
-            "user_id": user_id,
-            "client_ip": client_ip,
-            "user_agent": request.headers.get("User-Agent"),
-            "referer": request.headers.get("Referer"),
-        }
-        if trace_http:
-            extra_payload["request_body"] = request_body
-            extra_payload["response_body"] = response_body_str
-
-        logger.log(
+                bodies["request_body"] = "<unavailable>"
+            try:
+                bodies["response_body"] = self._format_body(bytes(response_sample))
+            except Exception:
+                bodies["response_body"] = "<unavailable>"
+
+        _emit_http_log(
             level,
-            message,
-            request.method,
-            route,
-            status_code,
-            duration_ms,
-            request_id,
-            user_id,
-            client_ip or "-",
-            request.url.query or "-",
-            request.headers.get("User-Agent") or "-",
-            request.headers.get("Referer") or "-",
-            extra={"extra": extra_payload},
+            method=method,
+            route=route,
+            status=status_code,
+            elapsed=elapsed,
+            request_id=request_id,
+            fields=client_fields(),
+            bodies=bodies,
         )
-        return response
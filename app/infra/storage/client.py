@@ -97,6 +97,32 @@ class StorageClient(Protocol):
         """
         ...
 
+    def presign_upload_parts(
+        self,
+        *,
+        bucket: str,
+        object_key: str,
+        upload_id: str,
+        part_numbers: Sequence[int],
+        expires_in: int,
+    ) -> list[str]:
+        """Generate presigned URLs for several parts of one multipart upload.
+
+        Args:
+            bucket: Target bucket name.
+            object_key: Object key (path) in the bucket.
+            upload_id: Multipart upload ID from init_multipart_upload.
+            part_numbers: Part numbers (1-based, max 10000).
+            expires_in: URL expiration time in seconds.
+
+        Returns:
+            Presigned PUT URLs in the same order as ``part_numbers``.
+
+        Raises:
+            StorageError: If URL generation fails.
+        """
+        ...
+
     def complete_multipart_upload(
         self,
         *,
@@ -10,7 +10,13 @@ Dependencies:
 
 from __future__ import annotations
 
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from operator import attrgetter
 from typing import TYPE_CHECKING, Any, Sequence
+from urllib.parse import quote
 
 from app.infra.storage.client import (
     CompletedPart,
@@ -23,6 +29,123 @@ if TYPE_CHECKING:
     from app.common.config import Settings
 
 
+_part_number = attrgetter("part_number")
+
+PRESIGN_CACHE_MAX_ENTRIES = 1024
+# SigV4 presigned URLs may be valid for at most seven days.
+PRESIGN_MAX_EXPIRES_SECONDS = 7 * 24 * 3600
+# Extra validity added on top of the promised lifetime so a cached URL can be
+# reused; kept small so the configured exposure window is barely extended.
+PRESIGN_CACHE_MAX_SURPLUS_SECONDS = 60
+
+_QUOTE_ESCAPES = str.maketrans({'"': '\\"', "\\": "\\\\"})
+
+
+@lru_cache(maxsize=4096)
+def _content_disposition(filename: str) -> str:
+    """Build an attachment Content-Disposition value for ``filename``.
+
+    The quoted ``filename`` parameter escapes quotes and backslashes; the RFC 5987
+    ``filename*`` parameter carries the exact UTF-8 name for non-ASCII filenames.
+    """
+    escaped = filename.translate(_QUOTE_ESCAPES)
+    encoded = quote(filename, safe="")
+    return f"attachment; filename=\"{escaped}\"; filename*=UTF-8''{encoded}"
+
+
+def _signing_lifetime(expires_in: int) -> int:
+    """Return how long to sign a URL for when ``expires_in`` is promised.
+
+    URLs are signed for ``expires_in`` plus a small surplus (a tenth of the
+    lifetime, at most ``PRESIGN_CACHE_MAX_SURPLUS_SECONDS``, within the SigV4
+    limit); the surplus is how long the cache may keep handing them out.
+    """
+    surplus = min(PRESIGN_CACHE_MAX_SURPLUS_SECONDS, expires_in // 10)
+    return max(expires_in, min(expires_in + surplus, PRESIGN_MAX_EXPIRES_SECONDS))
+
+
+class _PresignCache:
+    """Process-wide LRU cache of presigned URLs.
+
+    Entries are signed for longer than the lifetime promised to callers and are
+    only reused while the remaining validity still covers that promise.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[Any, ...], tuple[float, str]] = OrderedDict()
+
+    def get(self, key: tuple[Any, ...]) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: tuple[Any, ...], url: str, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        deadline = time.monotonic() + ttl
+        with self._lock:
+            self._entries[key] = (deadline, url)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_presign_cache = _PresignCache(PRESIGN_CACHE_MAX_ENTRIES)
+
+
+@lru_cache(maxsize=8)
+def _shared_boto_client(
+    endpoint_url: str | None,
+    region: str | None,
+    access_key_id: str | None,
+    secret_access_key: str | None,
+    use_ssl: bool,
+    addressing_style: str,
+    pool_size: int,
+) -> Any:
+    """Create (once per configuration) a boto3 S3 client."""
+    try:
+        import boto3
+        from botocore.config import Config
+    except ImportError as exc:
+        raise StorageError(
+            "boto3 and botocore are required for S3 storage backend. "
+            "Install with: pip install boto3"
+        ) from exc
+
+    config = Config(
+        s3={"addressing_style": addressing_style},
+        signature_version="s3v4",  # 强制使用 V4 签名，兼容 MinIO
+        max_pool_connections=pool_size,
+        tcp_keepalive=True,
+        # adaptive：指数退避加抖动，并用客户端令牌桶在限流/故障时主动降速
+        retries={"mode": "adaptive", "max_attempts": 5},
+    )
+
+    # 独立的 boto3 Session 只在首次创建时加载一次 botocore 数据模型
+    return boto3.session.Session().client(
+        "s3",
+        endpoint_url=endpoint_url,
+        region_name=region,
+        aws_access_key_id=access_key_id,
+        aws_secret_access_key=secret_access_key,
+        use_ssl=use_ssl,
+        config=config,
+    )
+
+
 class S3StorageClient:
     """S3-compatible object storage client.
 
@@ -41,33 +164,30 @@ class S3StorageClient:
         """
         self._settings = settings
         self._client = self._build_client(settings)
+        # Presigned URLs embed the signing credentials; keying the cache on them
+        # keeps URLs signed with a rotated-out key from being handed out.
+        self._presign_scope = (
+            settings.S3_ENDPOINT_URL,
+            settings.S3_REGION,
+            settings.S3_ACCESS_KEY_ID,
+        )
 
     @staticmethod
     def _build_client(settings: "Settings") -> Any:
-        """Create a boto3 S3 client from settings."""
-        try:
-            import boto3
-            from botocore.config import Config
-        except ImportError as exc:
-            raise StorageError(
-                "boto3 and botocore are required for S3 storage backend. "
-                "Install with: pip install boto3"
-            ) from exc
+        """Return the shared boto3 S3 client for these settings.
 
+        boto3 clients are thread-safe, so one client per distinct configuration
+        is reused across requests instead of reloading botocore models each time.
+        """
         addressing_style = (settings.S3_ADDRESSING_STYLE or "path").strip().lower()
-        config = Config(
-            s3={"addressing_style": addressing_style},
-            signature_version="s3v4",  # 强制使用 V4 签名，兼容 MinIO
-        )
-
-        return boto3.client(
-            "s3",
-            endpoint_url=settings.S3_ENDPOINT_URL,
-            region_name=settings.S3_REGION,
-            aws_access_key_id=settings.S3_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.S3_SECRET_ACCESS_KEY,
-            use_ssl=bool(settings.S3_USE_SSL),
-            config=config,
+        return _shared_boto_client(
+            settings.S3_ENDPOINT_URL,
+            settings.S3_REGION,
+            settings.S3_ACCESS_KEY_ID,
+            settings.S3_SECRET_ACCESS_KEY,
+            bool(settings.S3_USE_SSL),
+            addressing_style,
+            int(settings.S3_POOL_SIZE),
         )
 
     def init_multipart_upload(
@@ -109,7 +229,25 @@ class S3StorageClient:
         part_number: int,
         expires_in: int,
     ) -> str:
-        """Generate a presigned URL for uploading a part."""
+        """Generate a presigned URL for uploading a part.
+
+        URLs are signed with a small surplus over ``expires_in`` and served from
+        a process-wide cache while at least ``expires_in`` seconds remain valid.
+        """
+        cache_key = (
+            "upload_part",
+            self._presign_scope,
+            bucket,
+            object_key,
+            upload_id,
+            int(part_number),
+            int(expires_in),
+        )
+        cached = _presign_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        signed_for = _signing_lifetime(int(expires_in))
         try:
             url = self._client.generate_presigned_url(
                 "upload_part",
@@ -119,7 +257,7 @@ class S3StorageClient:
                     "UploadId": upload_id,
                     "PartNumber": int(part_number),
                 },
-                ExpiresIn=int(expires_in),
+                ExpiresIn=signed_for,
             )
         except Exception as exc:
             raise StorageError(f"Failed to generate presigned URL: {exc}") from exc
@@ -127,8 +265,34 @@ class S3StorageClient:
         if not url:
             raise StorageError("Generated presigned URL is empty")
 
+        _presign_cache.put(cache_key, str(url), signed_for - int(expires_in))
         return str(url)
 
+    def presign_upload_parts(
+        self,
+        *,
+        bucket: str,
+        object_key: str,
+        upload_id: str,
+        part_numbers: Sequence[int],
+        expires_in: int,
+    ) -> list[str]:
+        """Generate presigned URLs for several parts of one multipart upload.
+
+        Cached URLs are reused; only the missing parts are signed.
+        """
+        presign = self.presign_upload_part
+        return [
+            presign(
+                bucket=bucket,
+                object_key=object_key,
+                upload_id=upload_id,
+                part_number=part_number,
+                expires_in=expires_in,
+            )
+            for part_number in part_numbers
+        ]
+
     def complete_multipart_upload(
         self,
         *,
@@ -138,10 +302,12 @@ class S3StorageClient:
         parts: Sequence[CompletedPart],
     ) -> None:
         """Complete a multipart upload by combining all parts."""
+        # Clients usually send parts already in order; timsort handles that in O(n).
+        # part_number is validated as int when the request is parsed.
         multipart_payload = {
             "Parts": [
-                {"ETag": part.etag, "PartNumber": int(part.part_number)}
-                for part in sorted(parts, key=lambda p: p.part_number)
+                {"ETag": part.etag, "PartNumber": part.part_number}
+                for part in sorted(parts, key=_part_number)
             ]
         }
 
@@ -194,20 +360,33 @@ class S3StorageClient:
         expires_in: int,
         filename: str | None = None,
     ) -> str:
-        """Generate a presigned URL for downloading an object."""
+        """Generate a presigned URL for downloading an object.
+
+        URLs are signed with a small surplus over ``expires_in`` and served from
+        a process-wide cache while at least ``expires_in`` seconds remain valid.
+        """
+        cache_key = (
+            "get_object",
+            self._presign_scope,
+            bucket,
+            object_key,
+            filename,
+            int(expires_in),
+        )
+        cached = _presign_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         params: dict[str, Any] = {"Bucket": bucket, "Key": object_key}
         if filename:
-            # Escape quotes in filename for Content-Disposition header
-            safe_filename = filename.replace('"', '\\"')
-            params["ResponseContentDisposition"] = (
-                f'attachment; filename="{safe_filename}"'
-            )
+            params["ResponseContentDisposition"] = _content_disposition(filename)
 
+        signed_for = _signing_lifetime(int(expires_in))
         try:
             url = self._client.generate_presigned_url(
                 "get_object",
                 Params=params,
-                ExpiresIn=int(expires_in),
+                ExpiresIn=signed_for,
             )
         except Exception as exc:
             raise StorageError(f"Failed to generate download URL: {exc}") from exc
@@ -215,6 +394,7 @@ class S3StorageClient:
         if not url:
             raise StorageError("Generated presigned URL is empty")
 
+        _presign_cache.put(cache_key, str(url), signed_for - int(expires_in))
         return str(url)
 
     def delete_object(self, *, bucket: str, object_key: str) -> None:
@@ -1,16 +1,21 @@
+import asyncio
+import importlib.util
 import logging
+import time
+from functools import lru_cache
 
+import orjson
 import uvicorn
 from fastapi import Depends, FastAPI, HTTPException, Request
-from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from sqlalchemy import inspect, text
-from sqlalchemy.engine.url import make_url
+from fastapi.responses import ORJSONResponse, Response
+from sqlalchemy import text
+from sqlalchemy.engine.url import URL, make_url
 from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.v1.deps import get_db, require_api_key
+from app.api.v1.deps import get_async_db, require_api_key
 from app.api.v1.routers.admin import router as admin_router
 from app.api.v1.routers.assets import router as assets_router
 from app.api.v1.routers.documents import router as documents_router
@@ -19,7 +24,7 @@ from app.api.v1.routers.relationships import router as relationships_router
 from app.common.config import get_settings
 from app.common.logging import setup_logging
 from app.infra.db.alembic_support import get_head_revision, upgrade_to_head
-from app.infra.db.session import get_engine
+from app.infra.db.session import dispose_async_engine, get_engine
 from app.infra.observability.metrics import metrics_app
 from app.infra.observability.middleware import MetricsMiddleware
 
@@ -39,6 +44,42 @@ ERROR_CODE_BY_STATUS = {
     502: "bad_gateway",
     503: "service_unavailable",
 }
+# 422 由请求校验错误专用，与状态码表合并后一次查表即可
+_ERROR_CODE_TABLE = {**ERROR_CODE_BY_STATUS, 422: "validation_error"}
+
+_http_logger = logging.getLogger("http")
+_startup_logger = logging.getLogger("app.startup")
+
+# 自动迁移使用的 PostgreSQL 咨询锁键（ASCII "ndr-migr"）
+MIGRATION_ADVISORY_LOCK_KEY = 0x6E64722D6D696772
+
+# /ready 检查的必需表
+REQUIRED_TABLES = frozenset(
+    {
+        "documents",
+        "nodes",
+        "node_documents",
+        "assets",
+        "node_assets",
+        "idempotency_records",
+    }
+)
+
+# /ready 结构检查（表、迁移版本、扩展）通过后的复用时长，期间只做 SELECT 1
+READY_SCHEMA_CACHE_SECONDS = 30.0
+# “就绪”响应整体的复用时长，期间连 SELECT 1 也省去；未就绪结论从不缓存
+READY_CACHE_SECONDS = 2.0
+
+# PostgreSQL 下 /ready 的结构检查：当前 schema 的表清单与 ltree 扩展一次取回
+_READY_CATALOG_SQL = text(
+    "SELECT ARRAY(SELECT tablename::text FROM pg_catalog.pg_tables"
+    " WHERE schemaname = current_schema()),"
+    " EXISTS(SELECT 1 FROM pg_catalog.pg_extension WHERE extname = 'ltree')"
+)
+
+_HTTP_EXCEPTION_LOG_FORMAT = (
+    "http_exception status=%s detail=%s method=%s path=%s request_id=%s user_id=%s"
+)
 
 
 def _normalize_detail(detail):
@@ -54,17 +95,28 @@ def _normalize_detail(detail):
 
 
 def _resolve_error_code(status_code: int, override: str | None = None) -> str:
-    if override:
-        return override
-    if status_code == 422:
-        return "validation_error"
-    return ERROR_CODE_BY_STATUS.get(status_code, "unknown_error")
+    return override or _ERROR_CODE_TABLE.get(status_code, "unknown_error")
 
 
-def _collect_db_metadata(db_url: str) -> dict[str, object]:
+@lru_cache(maxsize=4)
+def _parse_db_url(db_url: str) -> URL | None:
+    """解析 DB_URL，同一地址只解析一次；URL 对象不可变，可安全共享。"""
     try:
-        url = make_url(db_url)
+        return make_url(db_url)
     except Exception:
+        return None
+
+
+_HEALTH_BODY = b'{"status":"ok"}'
+
+
+async def _health(request: Request) -> Response:
+    return Response(_HEALTH_BODY, media_type="application/json")
+
+
+def _collect_db_metadata(db_url: str) -> dict[str, object]:
+    url = _parse_db_url(db_url)
+    if url is None:
         return {"db_target": "<invalid>", "db_driver": "<unknown>"}
 
     payload: dict[str, object] = {"db_driver": url.drivername}
@@ -80,9 +132,8 @@ def _collect_db_metadata(db_url: str) -> dict[str, object]:
 
 
 def _describe_db_target(db_url: str) -> str:
-    try:
-        url = make_url(db_url)
-    except Exception:
+    url = _parse_db_url(db_url)
+    if url is None:
         return "<invalid DB_URL>"
 
     user = url.username or "?"
@@ -105,6 +156,11 @@ def _format_db_context(db_url: str) -> str:
     return ", ".join(parts)
 
 
+def _is_installed(module: str) -> bool:
+    """只查找模块规格而不导入，用于判断 uvloop/httptools 等可选 C 扩展是否可用。"""
+    return importlib.util.find_spec(module) is not None
+
+
 def create_app() -> FastAPI:
     settings = get_settings()
     setup_logging()
@@ -112,6 +168,8 @@ def create_app() -> FastAPI:
         title="NDR Service",
         version="v4.0",
         description="Documents & Nodes relationships service (MVP)",
+        # 路由返回值统一由 orjson 编码为 bytes（已开启 OPT_NON_STR_KEYS）
+        default_response_class=ORJSONResponse,
     )
 
     # Optional CORS
@@ -162,71 +220,109 @@ def create_app() -> FastAPI:
 
     @app.on_event("startup")
     def on_startup() -> None:
-        startup_logger = logging.getLogger("app.startup")
         if settings.AUTO_APPLY_MIGRATIONS:
             db_context_text = _format_db_context(settings.DB_URL)
-            startup_logger.info(
+            _startup_logger.info(
                 "正在执行数据库迁移前的连接检查。[event=auto_migration_precheck] (%s)",
                 db_context_text,
             )
             try:
-                engine = get_engine()
-                with engine.connect() as connection:
-                    connection.execute(text("SELECT 1"))
+                # AUTOCOMMIT：持锁期间不保留事务快照，以免阻塞迁移中的
+                # CREATE INDEX CONCURRENTLY
+                connection = (
+                    get_engine()
+                    .connect()
+                    .execution_options(isolation_level="AUTOCOMMIT")
+                )
+                connection.execute(text("SELECT 1"))
             except OperationalError as exc:
-                startup_logger.error(
+                _startup_logger.error(
                     "无法连接数据库，应用启动中断，请检查 DB_URL、账号密码或网络配置。"
                     " [event=auto_migration_connection_failed] (%s，error=%s)",
                     db_context_text,
                     exc,
                 )
                 raise
-            startup_logger.info(
-                "数据库连接检查通过，开始执行自动迁移。"
-                " [event=auto_migration_begin] (%s)",
-                db_context_text,
-            )
-            try:
-                upgrade_to_head()
-            except Exception as exc:
-                startup_logger.exception(
-                    "自动执行数据库迁移失败，请检查数据库权限与迁移脚本。"
-                    " [event=auto_migration_failed] (%s，error=%s)",
-                    db_context_text,
-                    exc,
-                )
-                raise
-            startup_logger.info(
-                "数据库迁移完成，应用继续启动。"
-                " [event=auto_migration_succeeded] (%s)",
-                db_context_text,
+            with connection:
+                # 多个 worker 同时启动时只有拿到咨询锁的进程执行迁移，
+                # 其余进程直接启动，由 /ready 在迁移完成前报告 out_of_date
+                lock_params = {"key": MIGRATION_ADVISORY_LOCK_KEY}
+                acquired = connection.execute(
+                    text("SELECT pg_try_advisory_lock(:key)"), lock_params
+                ).scalar()
+                if not acquired:
+                    _startup_logger.info(
+                        "其他进程正在执行数据库迁移，本进程跳过。"
+                        " [event=auto_migration_skipped] (%s)",
+                        db_context_text,
+                    )
+                else:
+                    try:
+                        _startup_logger.info(
+                            "数据库连接检查通过，开始执行自动迁移。"
+                            " [event=auto_migration_begin] (%s)",
+                            db_context_text,
+                        )
+                        try:
+                            upgrade_to_head()
+                        except Exception as exc:
+                            _startup_logger.exception(
+                                "自动执行数据库迁移失败，请检查数据库权限与迁移脚本。"
+                                " [event=auto_migration_failed] (%s，error=%s)",
+                                db_context_text,
+                                exc,
+                            )
+                            raise
+                        _startup_logger.info(
+                            "数据库迁移完成，应用继续启动。"
+                            " [event=auto_migration_succeeded] (%s)",
+                            db_context_text,
+                        )
+                    finally:
+                        connection.execute(
+                            text("SELECT pg_advisory_unlock(:key)"), lock_params
+                        )
+        # 预热 head 缓存：解析迁移目录的开销放在启动阶段，而不是首个 /ready 探针
+        try:
+            get_head_revision()
+        except Exception as exc:  # pragma: no cover - 交由 /ready 报告
+            _startup_logger.warning(
+                "读取迁移 head 版本失败。[event=alembic_head_unavailable] (error=%s)",
+                exc,
             )
 
+    @app.on_event("shutdown")
+    async def on_shutdown() -> None:
+        await dispose_async_engine()
+
     @app.exception_handler(HTTPException)
     async def http_exception_handler(request: Request, exc: HTTPException):
-        logger = logging.getLogger("http")
         normalized_detail, code_override = _normalize_detail(exc.detail)
-        logger.log(
+        # 直接读 scope 中的路径，并只取一次请求头，避免重复构造 URL 与查找头部
+        path: str = request.scope["path"]
+        request_id = request.headers.get("X-Request-Id")
+        user_id = request.headers.get("X-User-Id") or "<missing>"
+        _http_logger.log(
             logging.WARNING if exc.status_code < 500 else logging.ERROR,
-            "http_exception status=%s detail=%s method=%s path=%s request_id=%s user_id=%s",
+            _HTTP_EXCEPTION_LOG_FORMAT,
             exc.status_code,
             normalized_detail,
             request.method,
-            request.url.path,
-            request.headers.get("X-Request-Id"),
-            request.headers.get("X-User-Id") or "<missing>",
+            path,
+            request_id,
+            user_id,
             extra={
                 "extra": {
                     "status": exc.status_code,
                     "detail": normalized_detail,
                     "method": request.method,
-                    "route": request.url.path,
-                    "request_id": request.headers.get("X-Request-Id"),
-                    "user_id": request.headers.get("X-User-Id") or "<missing>",
+                    "route": path,
+                    "request_id": request_id,
+                    "user_id": user_id,
                 }
             },
         )
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=exc.status_code,
             media_type="application/problem+json",
             content={
@@ -236,7 +332,7 @@ def create_app() -> FastAPI:
                 "detail": normalized_detail,
                 "error_code": _resolve_error_code(exc.status_code, code_override),
                 "instance": str(request.url),
-                "request_id": request.headers.get("X-Request-Id"),
+                "request_id": request_id,
             },
         )
 
@@ -244,84 +340,106 @@ def create_app() -> FastAPI:
     async def request_validation_exception_handler(
         request: Request, exc: RequestValidationError
     ):
-        return JSONResponse(
+        content = {
+            "type": "about:blank",
+            "title": "Validation Error",
+            "status": 422,
+            "detail": exc.errors(),
+            "error_code": _resolve_error_code(422),
+            "instance": str(request.url),
+            "request_id": request.headers.get("X-Request-Id"),
+        }
+        # pydantic v2 的错误列表已是普通 dict/list，直接交给 orjson；
+        # ctx 中可能出现的异常对象等不可序列化值以 str() 兜底
+        return Response(
+            content=orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS),
             status_code=422,
             media_type="application/problem+json",
-            content={
-                "type": "about:blank",
-                "title": "Validation Error",
-                "status": 422,
-                # 确保可序列化
-                "detail": jsonable_encoder(exc.errors()),
-                "error_code": _resolve_error_code(422),
-                "instance": str(request.url),
-                "request_id": request.headers.get("X-Request-Id"),
-            },
         )
 
-    @app.get("/health")
-    async def health():
-        return {"status": "ok"}
+    # 存活探针注册为 Starlette 原生路由：不经 FastAPI 依赖解析与响应序列化
+    app.router.add_route("/health", _health, methods=["GET"])
 
-    @app.get("/ready")
-    async def ready(db=Depends(get_db)):
+    # 只缓存“就绪”结论：未就绪时每次重新检查，迁移完成后能立即翻转
+    schema_ready_until = 0.0
+
+    async def check_ready(db: AsyncSession) -> dict[str, object]:
+        nonlocal schema_ready_until
         try:
-            bind = db.get_bind()
-            db.execute(text("SELECT 1"))
-            inspector = inspect(bind)
-            tables = set(inspector.get_table_names())
-            required_tables = {
-                "documents",
-                "nodes",
-                "node_documents",
-                "assets",
-                "node_assets",
-                "idempotency_records",
-            }
-            missing = sorted(required_tables - tables)
+            await db.execute(text("SELECT 1"))
+            if schema_ready_until > time.monotonic():
+                return {"status": "ready"}
             detail: dict[str, object] = {}
+
+            # DB_URL 只允许 PostgreSQL（见 Settings）；表清单与 ltree 扩展合并为一次目录查询
+            table_names, ltree_enabled = (await db.execute(_READY_CATALOG_SQL)).one()
+            table_set = set(table_names or ())
+            missing = sorted(REQUIRED_TABLES.difference(table_set))
             if missing:
                 detail["missing_tables"] = missing
-
-            dialect = bind.dialect.name
-            if dialect == "postgresql":
-                head = get_head_revision()
-                try:
-                    current = db.execute(
-                        text("SELECT version_num FROM alembic_version")
-                    ).scalar_one_or_none()
-                except Exception as exc:  # pragma: no cover - defensive path
+            head = get_head_revision()
+            try:
+                current = (
+                    await db.execute(text("SELECT version_num FROM alembic_version"))
+                ).scalar_one_or_none()
+            except Exception as exc:  # pragma: no cover - defensive path
+                detail["migrations"] = {
+                    "status": "version_table_missing",
+                    "expected": head,
+                    "detail": str(exc),
+                }
+                current = None
+            else:
+                if head and current != head:
                     detail["migrations"] = {
-                        "status": "version_table_missing",
+                        "status": "out_of_date",
+                        "current": current,
                         "expected": head,
-                        "detail": str(exc),
                     }
-                    current = None
-                else:
-                    if head and current != head:
-                        detail["migrations"] = {
-                            "status": "out_of_date",
-                            "current": current,
-                            "expected": head,
-                        }
-                ltree_enabled = db.execute(
-                    text("SELECT 1 FROM pg_extension WHERE extname = 'ltree'")
-                ).scalar_one_or_none()
-                if not ltree_enabled:
-                    detail["ltree_extension"] = "missing"
+            if not ltree_enabled:
+                detail["ltree_extension"] = "missing"
 
             if detail:
                 return {"status": "not_ready", "detail": detail}
+            schema_ready_until = time.monotonic() + READY_SCHEMA_CACHE_SECONDS
             return {"status": "ready"}
-        except OperationalError as exc:
+        except (OperationalError, OSError) as exc:
+            # asyncpg 建连失败（拒绝连接、超时）抛出的是未经包装的 OSError
             return {"status": "not_ready", "detail": {"db": str(exc)}}
         except Exception as exc:  # pragma: no cover - defensive path
             return {"status": "not_ready", "detail": str(exc)}
 
+    # 整个“就绪”响应再做短时缓存：探针高频轮询时命中缓存即返回，不占用连接
+    ready_until = 0.0
+    ready_lock = asyncio.Lock()
+
+    @app.get("/ready")
+    async def ready(db: AsyncSession = Depends(get_async_db)):
+        nonlocal ready_until
+        if ready_until > time.monotonic():
+            return {"status": "ready"}
+        # 缓存过期后只放一个请求查库，并发探针排队复用其结论，避免同时击穿
+        async with ready_lock:
+            if ready_until > time.monotonic():
+                return {"status": "ready"}
+            payload = await check_ready(db)
+            if payload["status"] == "ready":
+                ready_until = time.monotonic() + READY_CACHE_SECONDS
+            return payload
+
     return app
 
 
 app = create_app()
 
 if __name__ == "__main__":
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
+    # 与镜像启动命令保持一致；未安装 uvloop/httptools（如精简环境）时交给 uvicorn 自动选择，
+    # 本地热重载通过 UVICORN_RELOAD=true 开启
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop" if _is_installed("uvloop") else "auto",
+        http="httptools" if _is_installed("httptools") else "auto",
+        reload=get_settings().UVICORN_RELOAD,
+    )
@@ -41,3 +41,22 @@ def test_admin_reindex_analyze_endpoint():
     payload = r.json()
     assert payload.get("method") == "analyze"
     assert "nodes" in payload.get("executed", [])
+
+
+def test_admin_row_counts_endpoint():
+    app = create_app()
+    client = TestClient(app)
+    headers = {"X-User-Id": "admin"}
+
+    for title in ("a", "b"):
+        resp = client.post("/api/v1/documents", json={"title": title}, headers=headers)
+        assert resp.status_code == 201
+    deleted_id = resp.json()["id"]
+    assert (
+        client.delete(f"/api/v1/documents/{deleted_id}", headers=headers).status_code
+        == 204
+    )
+
+    r = client.get("/api/v1/admin/stats/row-counts", headers=_admin_headers())
+    assert r.status_code == 200
+    assert r.json()["active"] == {"documents": 1, "nodes": 0, "assets": 0}
@@ -466,6 +466,11 @@ def test_list_documents_supports_metadata_and_query_filters():
     assert stage_in.status_code == 200
     assert {doc["id"] for doc in stage_in.json()["items"]} == set(created_ids)
 
+    # Equality on numeric metadata matches the JSON number
+    price_eq = client.get("/api/v1/documents", params={"metadata.price": "40"})
+    assert price_eq.status_code == 200
+    assert {doc["id"] for doc in price_eq.json()["items"]} == {created_ids[1]}
+
     # Fuzzy search across title/content
     search_resp = client.get("/api/v1/documents", params={"query": "Alpha"})
     assert search_resp.status_code == 200
@@ -499,6 +504,77 @@ def test_list_documents_supports_metadata_and_query_filters():
     assert {doc["id"] for doc in tag_all_resp.json()["items"]} == {created_ids[0]}
 
 
+def test_metadata_equality_matches_raw_text_only():
+    app = create_app()
+    client = TestClient(app)
+    headers = {"X-User-Id": "searcher"}
+
+    prices = [40, 40.0, "40", " 40 ", True, "true"]
+    created_ids: list[int] = []
+    for index, price in enumerate(prices):
+        resp = client.post(
+            "/api/v1/documents",
+            json={
+                "title": f"Raw Price {index}",
+                "metadata": {"raw_price": price},
+                "content": {},
+            },
+            headers=headers,
+        )
+        assert resp.status_code == 201
+        created_ids.append(resp.json()["id"])
+
+    def matched(value: str) -> set[int]:
+        resp = client.get("/api/v1/documents", params={"metadata.raw_price": value})
+        assert resp.status_code == 200
+        return {doc["id"] for doc in resp.json()["items"]} & set(created_ids)
+
+    # "40" 命中数字 40 与字符串 "40"，但不命中 JSON 的 40.0（->> 为 "40.0"）
+    assert matched("40") == {created_ids[0], created_ids[2]}
+    assert matched("40.0") == {created_ids[1]}
+    # 带空白的值只按原样匹配字符串，不会被解析成数字 40
+    assert matched(" 40 ") == {created_ids[3]}
+    assert matched("true") == {created_ids[4], created_ids[5]}
+    assert matched("4e1") == set()
+
+
+def test_metadata_tag_filters_match_string_and_object_fields():
+    app = create_app()
+    client = TestClient(app)
+    headers = {"X-User-Id": "searcher"}
+
+    tag_values = [
+        ["alpha", "beta"],
+        "alpha",
+        {"alpha": 1, "beta": 2},
+        {"gamma": "alpha"},
+        "alpha beta",
+    ]
+    created_ids: list[int] = []
+    for index, tags in enumerate(tag_values):
+        resp = client.post(
+            "/api/v1/documents",
+            json={"title": f"Doc {index}", "metadata": {"tags": tags}},
+            headers=headers,
+        )
+        assert resp.status_code == 201
+        created_ids.append(resp.json()["id"])
+
+    def ids_for(params) -> set[int]:
+        resp = client.get("/api/v1/documents", params=params)
+        assert resp.status_code == 200
+        return {doc["id"] for doc in resp.json()["items"]}
+
+    # 字符串字段与对象键同样命中，对象的值与子串不命中
+    expected_any = {created_ids[0], created_ids[1], created_ids[2]}
+    assert ids_for({"metadata.tags": "alpha"}) == expected_any
+    assert ids_for({"metadata.tags[any]": "alpha"}) == expected_any
+    assert ids_for(
+        [("metadata.tags[all]", "alpha"), ("metadata.tags[all]", "beta")]
+    ) == {created_ids[0], created_ids[2]}
+    assert ids_for({"metadata.tags[all]": "alpha"}) == expected_any
+
+
 def test_subtree_documents_supports_filters():
     app = create_app()
     client = TestClient(app)
@@ -1330,3 +1406,68 @@ def test_subtree_documents_pagination():
     body3 = r3.json()
     assert body3["total"] == 1
     assert {d["id"] for d in body3["items"]} == {docs[0]["id"]}
+
+
+def test_list_documents_and_nodes_cursor_pagination():
+    app = create_app()
+    client = TestClient(app)
+    headers = {"X-User-Id": "cursor"}
+
+    doc_ids = []
+    for i in range(5):
+        resp = client.post(
+            "/api/v1/documents",
+            json={"title": f"Cursor{i}", "type": "cursor_doc", "position": i},
+            headers=headers,
+        )
+        assert resp.status_code == 201
+        doc_ids.append(resp.json()["id"])
+
+    r1 = client.get("/api/v1/documents", params={"type": "cursor_doc", "size": 2})
+    assert r1.status_code == 200
+    body1 = r1.json()
+    assert body1["total"] == 5
+    assert [d["id"] for d in body1["items"]] == doc_ids[:2]
+    assert body1["next_cursor"]
+
+    seen = [d["id"] for d in body1["items"]]
+    cursor = body1["next_cursor"]
+    while cursor:
+        resp = client.get(
+            "/api/v1/documents",
+            params={"type": "cursor_doc", "size": 2, "cursor": cursor},
+        )
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["total"] is None
+        seen.extend(d["id"] for d in body["items"])
+        cursor = body["next_cursor"]
+    assert seen == doc_ids
+
+    node_ids = []
+    for i in range(3):
+        resp = client.post(
+            "/api/v1/nodes",
+            json={
+                "name": f"CursorNode{i}",
+                "slug": f"cursor-node-{i}",
+                "type": "cursor_node",
+            },
+            headers=headers,
+        )
+        assert resp.status_code == 201
+        node_ids.append(resp.json()["id"])
+
+    first = client.get(
+        "/api/v1/nodes", params={"type": "cursor_node", "size": 2}
+    ).json()
+    assert [n["id"] for n in first["items"]] == node_ids[::-1][:2]
+    rest = client.get(
+        "/api/v1/nodes",
+        params={"type": "cursor_node", "size": 2, "cursor": first["next_cursor"]},
+    ).json()
+    assert [n["id"] for n in rest["items"]] == node_ids[:1]
+    assert rest["total"] is None and rest["next_cursor"] is None
+
+    bad = client.get("/api/v1/documents", params={"cursor": "not-a-cursor"})
+    assert bad.status_code == 400
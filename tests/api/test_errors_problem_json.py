@@ -1,4 +1,5 @@
 from fastapi.testclient import TestClient
+from pydantic import BaseModel, field_validator
 
 from app.main import create_app
 
@@ -32,3 +33,26 @@ def test_validation_error_problem_json():
     assert body.get("status") == 422
     assert body.get("error_code") == "validation_error"
     assert isinstance(body.get("detail"), list)
+
+
+def test_validation_error_with_exception_context_is_serialized():
+    app = create_app()
+
+    class Payload(BaseModel):
+        name: str
+
+        @field_validator("name")
+        @classmethod
+        def reject(cls, value: str) -> str:
+            raise ValueError("bad name")
+
+    @app.post("/_validation_probe")
+    def probe(payload: Payload):
+        return {"ok": True}
+
+    client = TestClient(app)
+    r = client.post("/_validation_probe", json={"name": "x"})
+    assert r.status_code == 422
+    assert r.headers.get("content-type", "").startswith("application/problem+json")
+    detail = r.json()["detail"]
+    assert detail[0]["ctx"]["error"] == "bad name"
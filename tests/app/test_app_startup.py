@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 from fastapi.testclient import TestClient
+from sqlalchemy import text
 
 from app.common.config import get_settings
-from app.main import create_app
+from app.infra.db.session import get_engine
+from app.main import MIGRATION_ADVISORY_LOCK_KEY, create_app
 
 
 def test_startup_runs_alembic_upgrade(monkeypatch):
@@ -40,3 +42,26 @@ def test_startup_skips_alembic_when_disabled(monkeypatch):
 
     assert not calls, "upgrade_to_head should be skipped when auto-apply is disabled"
     get_settings.cache_clear()  # type: ignore[attr-defined]
+
+
+def test_startup_skips_alembic_when_another_worker_holds_lock(monkeypatch):
+    calls: list[bool] = []
+
+    def fake_upgrade() -> None:
+        calls.append(True)
+
+    monkeypatch.setenv("AUTO_APPLY_MIGRATIONS", "true")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    monkeypatch.setattr("app.main.upgrade_to_head", fake_upgrade)
+
+    params = {"key": MIGRATION_ADVISORY_LOCK_KEY}
+    with get_engine().connect() as holder:
+        holder.execute(text("SELECT pg_advisory_lock(:key)"), params)
+        try:
+            with TestClient(create_app()):
+                pass
+        finally:
+            holder.execute(text("SELECT pg_advisory_unlock(:key)"), params)
+
+    assert not calls, "only the worker holding the migration lock should upgrade"
+    get_settings.cache_clear()  # type: ignore[attr-defined]
@@ -0,0 +1,46 @@
+"""测试按主键区间分批计数 app/domain/repositories/batch_count.py。"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import DateTime, create_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+
+from app.domain.repositories.batch_count import batch_count
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class _Row(_Base):
+    __tablename__ = "batch_count_rows"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    deleted_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+
+@pytest.fixture()
+def session():
+    engine = create_engine("sqlite://")
+    _Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def test_empty_table_returns_zero(session: Session) -> None:
+    assert batch_count(session, _Row.id, _Row.deleted_at.is_(None)) == 0
+
+
+def test_sums_batches_with_sparse_ids(session: Session) -> None:
+    """主键不连续、跨越多个批次时仍得到精确总数。"""
+    deleted = datetime(2024, 1, 1)
+    ids = [3, 4, 10, 11, 25, 99, 100]
+    session.add_all(_Row(id=pk, deleted_at=deleted if pk % 2 else None) for pk in ids)
+    session.flush()
+
+    assert batch_count(session, _Row.id, batch_size=7) == len(ids)
+    assert batch_count(session, _Row.id, _Row.deleted_at.is_(None), batch_size=7) == 3
@@ -0,0 +1,80 @@
+"""测试分页总数缓存 app/domain/repositories/count_cache.py。"""
+
+from __future__ import annotations
+
+import pytest
+
+from app.domain.repositories import count_cache
+from app.domain.repositories.count_cache import (
+    cached_count,
+    invalidate_counts,
+    short_page_total,
+)
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    invalidate_counts()
+    yield
+    invalidate_counts()
+
+
+def _counter(value: int):
+    calls: list[int] = []
+
+    def compute() -> int:
+        calls.append(value)
+        return value
+
+    return compute, calls
+
+
+class TestCachedCount:
+    """测试 cached_count 的命中、跳过与失效。"""
+
+    def test_caches_when_cacheable(self) -> None:
+        """cacheable=True 时第二次调用命中缓存，不再执行 COUNT。"""
+        compute, calls = _counter(42)
+        assert cached_count(("documents", False), compute, cacheable=True) == 42
+        assert cached_count(("documents", False), compute, cacheable=True) == 42
+        assert len(calls) == 1
+
+    def test_skips_cache_for_small_results(self) -> None:
+        """结果不足一页（cacheable=False）时每次都实时统计。"""
+        compute, calls = _counter(3)
+        cached_count(("documents", True), compute, cacheable=False)
+        cached_count(("documents", True), compute, cacheable=False)
+        assert len(calls) == 2
+
+    def test_distinct_filters_use_distinct_keys(self) -> None:
+        """不同过滤条件互不影响。"""
+        first, _ = _counter(1)
+        second, _ = _counter(2)
+        assert cached_count(("nodes", False, "a"), first, cacheable=True) == 1
+        assert cached_count(("nodes", False, "b"), second, cacheable=True) == 2
+
+    def test_invalidate_and_expiry(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """invalidate_counts 与 TTL 到期都会触发重新统计。"""
+        compute, calls = _counter(7)
+        cached_count(("nodes", False), compute, cacheable=True)
+        invalidate_counts()
+        cached_count(("nodes", False), compute, cacheable=True)
+        assert len(calls) == 2
+
+        monkeypatch.setattr(count_cache, "COUNT_CACHE_TTL_SECONDS", -1.0)
+        invalidate_counts()
+        cached_count(("nodes", False), compute, cacheable=True)
+        cached_count(("nodes", False), compute, cacheable=True)
+        assert len(calls) == 4
+
+
+class TestShortPageTotal:
+    """测试末页未占满时的总数推算。"""
+
+    def test_short_page_derives_total(self) -> None:
+        assert short_page_total(3, 20, 5) == 45
+        assert short_page_total(1, 20, 0) == 0
+
+    def test_full_or_out_of_range_page_needs_count(self) -> None:
+        assert short_page_total(2, 20, 20) is None
+        assert short_page_total(4, 20, 0) is None
@@ -23,14 +23,14 @@ def test_cleanup_idempotency_deletes_only_expired():
                     key="k1",
                     request_hash="h1",
                     status_code=200,
-                    response_body={"ok": True},
+                    response_body='{"ok":true}',
                     expires_at=now - timedelta(hours=1),
                 ),
                 IdempotencyRecord(
                     key="k2",
                     request_hash="h2",
                     status_code=201,
-                    response_body={"ok": True},
+                    response_body='{"ok":true}',
                     expires_at=now + timedelta(hours=1),
                 ),
             ]
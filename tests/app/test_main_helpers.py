@@ -6,6 +6,7 @@ from app.main import (
     _collect_db_metadata,
     _describe_db_target,
     _format_db_context,
+    _is_installed,
     _normalize_detail,
     _resolve_error_code,
 )
@@ -121,3 +122,12 @@ class TestDbContextFormatting:
         ctx = _format_db_context(url)
         assert "db_driver=<unknown>" in ctx
         assert "db_target=<invalid DB_URL>" in ctx
+
+
+class TestIsInstalled:
+    """测试 _is_installed 函数。"""
+
+    def test_detects_installed_and_missing_modules(self) -> None:
+        """已安装的模块返回 True，缺失的可选扩展返回 False 以便回退为 auto。"""
+        assert _is_installed("asyncio") is True
+        assert _is_installed("ndr_missing_loop_module") is False
@@ -1,7 +1,15 @@
+import uuid
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from fastapi.testclient import TestClient
 
-from app.infra.observability.metrics import metrics_app
+from app.infra.observability.metrics import (
+    LATENCY,
+    latency_histogram,
+    metrics_app,
+    request_counter,
+)
 from app.infra.observability.middleware import MetricsMiddleware
 
 
@@ -52,11 +60,71 @@ def test_request_id_propagation():
     client = TestClient(app)
 
     # auto-generate when missing
-    r1 = client.get("/health")
+    r1 = client.get("/api/v1/nodes/1")
     rid1 = r1.headers.get("X-Request-Id")
     assert rid1 is not None and len(rid1) > 0
 
     # echo when provided
     rid = "req-abc-123"
-    r2 = client.get("/health", headers={"X-Request-Id": rid})
+    r2 = client.get("/api/v1/nodes/1", headers={"X-Request-Id": rid})
     assert r2.headers.get("X-Request-Id") == rid
+
+
+def test_streaming_response_passes_through_with_request_id():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([b"a", b"b", b"c"]), media_type="text/plain")
+
+    client = TestClient(app)
+    r = client.get("/stream", headers={"X-Request-Id": "req-stream"})
+    assert r.status_code == 200
+    assert r.text == "abc"
+    assert r.headers.get("X-Request-Id") == "req-stream"
+
+
+def test_generated_request_id_is_uuid_hex():
+    client = TestClient(build_app())
+    rid = client.get("/api/v1/nodes/1").headers.get("X-Request-Id")
+    assert rid is not None
+    assert uuid.UUID(hex=rid).hex == rid
+
+
+def test_metric_children_are_cached_per_label_set():
+    assert request_counter("GET", "/health", "200") is request_counter(
+        "GET", "/health", "200"
+    )
+    assert latency_histogram("GET", "/health") is LATENCY.labels("GET", "/health")
+
+
+def test_probe_and_scrape_paths_bypass_metrics():
+    client = TestClient(build_app())
+    health = request_counter("GET", "/health", "200")
+    before = health._value.get()
+    assert client.get("/health").status_code == 200
+    assert client.get("/metrics").status_code == 200
+    assert health._value.get() == before
+    assert 'route="/metrics"' not in client.get("/metrics").text
+
+
+def test_probe_and_scrape_paths_keep_request_id():
+    client = TestClient(build_app())
+    health = client.get("/health", headers={"X-Request-Id": "probe-1"})
+    assert health.headers.get("X-Request-Id") == "probe-1"
+    generated = client.get("/metrics").headers.get("X-Request-Id")
+    assert generated is not None
+    assert uuid.UUID(hex=generated).hex == generated
+
+
+def test_existing_response_request_id_is_not_duplicated():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/own-id")
+    def own_id():
+        return PlainTextResponse("ok", headers={"X-Request-Id": "from-handler"})
+
+    r = TestClient(app).get("/own-id", headers={"X-Request-Id": "from-client"})
+    assert r.headers.get_list("x-request-id") == ["from-handler"]
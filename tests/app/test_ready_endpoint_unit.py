@@ -9,7 +9,7 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.exc import OperationalError
 
-from app.api.v1.deps import get_db
+from app.api.v1.deps import get_async_db
 from app.common.config import get_settings
 
 
@@ -27,7 +27,7 @@ class _FakeBind:
     dialect: _FakeDialect
 
 
-class _FakeScalar:
+class _FakeResult:
     """模拟 SQLAlchemy execute 结果。"""
 
     def __init__(self, value: Any) -> None:
@@ -36,19 +36,12 @@ class _FakeScalar:
     def scalar_one_or_none(self) -> Any:
         return self._value
 
-
-class _FakeInspector:
-    """模拟 SQLAlchemy inspector。"""
-
-    def __init__(self, table_names: list[str]) -> None:
-        self._table_names = table_names
-
-    def get_table_names(self) -> list[str]:
-        return list(self._table_names)
+    def one(self) -> Any:
+        return self._value
 
 
 class _FakeSession:
-    """模拟 SQLAlchemy Session，支持各种测试场景。"""
+    """模拟 SQLAlchemy AsyncSession，支持各种测试场景。"""
 
     def __init__(
         self,
@@ -64,28 +57,32 @@ class _FakeSession:
         self._current_revision = current_revision
         self._ltree_enabled = ltree_enabled
         self._raise_on_select1 = raise_on_select1
+        self.catalog_queries = 0
+        self.select1_queries = 0
 
     def get_bind(self) -> _FakeBind:
         return self._bind
 
-    def execute(self, statement: Any) -> _FakeScalar:
+    async def execute(self, statement: Any) -> _FakeResult:
         text_value = getattr(statement, "text", str(statement))
 
+        # PostgreSQL 目录查询：表清单 + ltree 扩展
+        if "pg_tables" in text_value:
+            self.catalog_queries += 1
+            return _FakeResult((list(self._table_names), self._ltree_enabled))
+
         # SELECT 1 健康检查
-        if "SELECT 1" in text_value and "pg_extension" not in text_value:
+        if "SELECT 1" in text_value:
+            self.select1_queries += 1
             if self._raise_on_select1:
                 raise OperationalError("SELECT 1", {}, Exception("db down"))
-            return _FakeScalar(1)
+            return _FakeResult(1)
 
         # alembic 版本查询
         if "FROM alembic_version" in text_value:
-            return _FakeScalar(self._current_revision)
-
-        # ltree 扩展检查
-        if "FROM pg_extension" in text_value and "ltree" in text_value:
-            return _FakeScalar(1 if self._ltree_enabled else None)
+            return _FakeResult(self._current_revision)
 
-        return _FakeScalar(None)
+        return _FakeResult(None)
 
 
 def _required_tables() -> list[str]:
@@ -122,15 +119,10 @@ class TestReadyEndpoint:
             ltree_enabled=True,
         )
 
-        def override_get_db():
+        async def override_get_db():
             yield fake_session
 
-        app.dependency_overrides[get_db] = override_get_db
-        monkeypatch.setattr(
-            main_mod,
-            "inspect",
-            lambda bind: _FakeInspector(fake_session._table_names),
-        )
+        app.dependency_overrides[get_async_db] = override_get_db
         monkeypatch.setattr(main_mod, "get_head_revision", lambda: "rev_head")
 
         client = TestClient(app)
@@ -157,15 +149,10 @@ class TestReadyEndpoint:
             ltree_enabled=True,
         )
 
-        def override_get_db():
+        async def override_get_db():
             yield fake_session
 
-        app.dependency_overrides[get_db] = override_get_db
-        monkeypatch.setattr(
-            main_mod,
-            "inspect",
-            lambda bind: _FakeInspector(fake_session._table_names),
-        )
+        app.dependency_overrides[get_async_db] = override_get_db
         monkeypatch.setattr(main_mod, "get_head_revision", lambda: "rev_head")
 
         client = TestClient(app)
@@ -193,15 +180,10 @@ class TestReadyEndpoint:
             ltree_enabled=False,  # ltree 未启用
         )
 
-        def override_get_db():
+        async def override_get_db():
             yield fake_session
 
-        app.dependency_overrides[get_db] = override_get_db
-        monkeypatch.setattr(
-            main_mod,
-            "inspect",
-            lambda bind: _FakeInspector(fake_session._table_names),
-        )
+        app.dependency_overrides[get_async_db] = override_get_db
         monkeypatch.setattr(main_mod, "get_head_revision", lambda: "rev_head")
 
         client = TestClient(app)
@@ -212,39 +194,37 @@ class TestReadyEndpoint:
         assert payload["status"] == "not_ready"
         assert payload["detail"]["ltree_extension"] == "missing"
 
-    def test_reports_ready_for_non_postgres(
-        self, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
-        """非 PostgreSQL 数据库在表齐全时应该报告 ready。"""
+    def test_handles_operational_error(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """数据库连接失败时应该报告 not_ready。"""
         import app.main as main_mod
 
         app = main_mod.create_app()
 
         fake_session = _FakeSession(
-            dialect_name="sqlite",  # 非 PostgreSQL
+            dialect_name="postgresql",
             table_names=_required_tables(),
-            current_revision=None,
+            current_revision="rev_head",
             ltree_enabled=True,
+            raise_on_select1=True,  # SELECT 1 时抛出异常
         )
 
-        def override_get_db():
+        async def override_get_db():
             yield fake_session
 
-        app.dependency_overrides[get_db] = override_get_db
-        monkeypatch.setattr(
-            main_mod,
-            "inspect",
-            lambda bind: _FakeInspector(fake_session._table_names),
-        )
+        app.dependency_overrides[get_async_db] = override_get_db
 
         client = TestClient(app)
         r = client.get("/ready")
 
         assert r.status_code == 200
-        assert r.json() == {"status": "ready"}
+        payload = r.json()
+        assert payload["status"] == "not_ready"
+        assert "db" in payload["detail"]
 
-    def test_handles_operational_error(self, monkeypatch: pytest.MonkeyPatch) -> None:
-        """数据库连接失败时应该报告 not_ready。"""
+    def test_reuses_schema_checks_while_ready(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """就绪后缓存期内只做 SELECT 1，不再查询目录。"""
         import app.main as main_mod
 
         app = main_mod.create_app()
@@ -254,23 +234,67 @@ class TestReadyEndpoint:
             table_names=_required_tables(),
             current_revision="rev_head",
             ltree_enabled=True,
-            raise_on_select1=True,  # SELECT 1 时抛出异常
         )
 
-        def override_get_db():
+        async def override_get_db():
             yield fake_session
 
-        app.dependency_overrides[get_db] = override_get_db
-        monkeypatch.setattr(
-            main_mod,
-            "inspect",
-            lambda bind: _FakeInspector(fake_session._table_names),
-        )
+        app.dependency_overrides[get_async_db] = override_get_db
+        monkeypatch.setattr(main_mod, "get_head_revision", lambda: "rev_head")
+        monkeypatch.setattr(main_mod, "READY_CACHE_SECONDS", 0.0)
 
         client = TestClient(app)
-        r = client.get("/ready")
+        assert client.get("/ready").json() == {"status": "ready"}
+        assert client.get("/ready").json() == {"status": "ready"}
+        assert fake_session.catalog_queries == 1
+        assert fake_session.select1_queries == 2
 
-        assert r.status_code == 200
-        payload = r.json()
+        fake_session._raise_on_select1 = True
+        payload = client.get("/ready").json()
         assert payload["status"] == "not_ready"
         assert "db" in payload["detail"]
+
+    def test_caches_ready_response_but_not_failures(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """就绪响应在缓存期内直接返回；未就绪结论不缓存。"""
+        import app.main as main_mod
+
+        app = main_mod.create_app()
+
+        fake_session = _FakeSession(
+            dialect_name="postgresql",
+            table_names=_required_tables(),
+            current_revision="rev_old",
+            ltree_enabled=True,
+        )
+
+        async def override_get_db():
+            yield fake_session
+
+        app.dependency_overrides[get_async_db] = override_get_db
+        monkeypatch.setattr(main_mod, "get_head_revision", lambda: "rev_head")
+
+        client = TestClient(app)
+        assert client.get("/ready").json()["status"] == "not_ready"
+        fake_session._current_revision = "rev_head"
+        assert client.get("/ready").json() == {"status": "ready"}
+        assert fake_session.select1_queries == 2
+
+        fake_session._raise_on_select1 = True
+        assert client.get("/ready").json() == {"status": "ready"}
+        assert fake_session.select1_queries == 2
+
+
+def test_health_is_served_without_dependencies(monkeypatch: pytest.MonkeyPatch) -> None:
+    """/health 为原生路由，不依赖数据库即返回固定响应。"""
+    import app.main as main_mod
+
+    monkeypatch.setenv("AUTO_APPLY_MIGRATIONS", "false")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+
+    r = TestClient(main_mod.create_app()).get("/health")
+
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/json"
+    assert r.json() == {"status": "ok"}
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import orjson
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.testclient import TestClient
 
 from app.common.config import get_settings
@@ -123,3 +124,99 @@ def test_middleware_logs_downstream_exception(caplog, monkeypatch):
     assert hasattr(rec, "extra") and isinstance(rec.extra, dict)
     assert rec.extra.get("status") == 500
     assert "RuntimeError" in (rec.extra.get("exception") or "")
+
+
+def test_mask_text_masks_key_value_fragments():
+    middleware = MetricsMiddleware(FastAPI())
+    masked = middleware._mask_text("token=abc123 password: hunter2 user=alice")
+    assert masked == "token: *** password: *** user=alice"
+
+
+def test_trace_bodies_skipped_when_info_logging_disabled(caplog, monkeypatch):
+    """http 日志级别高于 INFO 时不采集请求体与响应体。"""
+    monkeypatch.setenv("TRACE_HTTP", "true")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+
+    formatted: list[bytes] = []
+    monkeypatch.setattr(
+        MetricsMiddleware, "_format_body", lambda self, raw: formatted.append(raw)
+    )
+
+    client = TestClient(build_app())
+    with caplog.at_level("WARNING", logger="http"):
+        r = client.post("/echo", json={"password": "p@ss", "token": "abc123"})
+        assert r.status_code == 200
+        assert r.json()["token"] == "abc123"
+
+    assert formatted == []
+    assert not [rec for rec in caplog.records if rec.name == "http"]
+
+
+def test_format_body_masks_truncated_json_sample():
+    """超过采样上限的 JSON 无法解析时，仍按文本规则脱敏并标记截断。"""
+    middleware = MetricsMiddleware(FastAPI())
+    raw = b'{"password": "p@ss", "data": "' + b"x" * 10_000 + b'"}'
+    formatted = middleware._format_body(raw) or ""
+    assert "p@ss" not in formatted
+    assert formatted.endswith("...<truncated>")
+
+
+def test_format_body_masks_all_sensitive_keys_in_truncated_json():
+    """截断回退路径覆盖全部敏感字段，含空格或被截断的字符串值整段遮盖。"""
+    middleware = MetricsMiddleware(FastAPI())
+    raw = orjson.dumps(
+        {"pwd": "hunter2", "password": "my secret pass", "pad": "x" * 5000}
+    )
+    formatted = middleware._format_body(raw) or ""
+    assert "hunter2" not in formatted
+    assert "secret pass" not in formatted
+    assert formatted.startswith('{"pwd": "***","password": "***",')
+
+    cut = b'{"pad": "' + b"x" * 1900 + b'", "passwd": "a long secret ' + b"z" * 500
+    formatted = middleware._format_body(cut) or ""
+    assert "long secret" not in formatted
+    assert '"passwd": "***' in formatted
+    assert formatted.endswith("...<truncated>")
+
+
+def test_trace_keeps_streaming_body_intact_and_samples_log(caplog, monkeypatch):
+    """追踪模式下流式响应完整下发，日志只保留截断后的样本。"""
+    monkeypatch.setenv("TRACE_HTTP", "true")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([b"x" * 3000] * 4), media_type="text/plain")
+
+    client = TestClient(app)
+    with caplog.at_level("INFO"):
+        r = client.get("/stream")
+    assert r.status_code == 200
+    assert len(r.content) == 12000
+
+    rec = [rec for rec in caplog.records if rec.name == "http"][-1]
+    response_body = rec.extra.get("response_body") or ""
+    assert response_body.endswith("...<truncated>")
+    assert len(response_body) < 3000
+
+
+def test_mask_mapping_masks_nested_keys_in_place():
+    middleware = MetricsMiddleware(FastAPI())
+    payload = {"user": {"Password": "p", "items": [{"token": "t"}, 1]}, "ok": True}
+    masked = middleware._mask_mapping(payload)
+    assert masked is payload
+    assert masked == {
+        "user": {"Password": "***", "items": [{"token": "***"}, 1]},
+        "ok": True,
+    }
+
+
+def test_format_body_truncates_on_utf8_boundary():
+    middleware = MetricsMiddleware(FastAPI())
+    formatted = middleware._format_body(("中" * 1000).encode("utf-8")) or ""
+    assert formatted.endswith("...<truncated>")
+    assert "�" not in formatted
+    assert set(formatted.removesuffix("...<truncated>")) == {"中"}
@@ -32,6 +32,7 @@ os.environ["DESTRUCTIVE_API_KEY"] = (
     os.environ.get("DESTRUCTIVE_API_KEY") or "admin-secret"
 )
 get_settings.cache_clear()  # type: ignore[attr-defined]
+from app.domain.repositories.count_cache import invalidate_counts  # noqa: E402
 from app.infra.db.alembic_support import upgrade_to_head  # noqa: E402
 from app.infra.db.session import get_session_factory, reset_engine  # noqa: E402
 
@@ -64,13 +65,15 @@ def cleanup_tables(apply_migrations):
     with _session_scope() as session:
         session.execute(
             text(
-                "TRUNCATE idempotency_records, node_assets, node_documents, assets, nodes, documents RESTART IDENTITY CASCADE"
+                "TRUNCATE idempotency_records, node_assets, node_documents, assets, nodes, documents, document_positions RESTART IDENTITY CASCADE"
             )
         )
+    invalidate_counts()
     yield
     with _session_scope() as session:
         session.execute(
             text(
-                "TRUNCATE idempotency_records, node_assets, node_documents, assets, nodes, documents RESTART IDENTITY CASCADE"
+                "TRUNCATE idempotency_records, node_assets, node_documents, assets, nodes, documents, document_positions RESTART IDENTITY CASCADE"
             )
         )
+    invalidate_counts()
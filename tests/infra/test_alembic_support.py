@@ -0,0 +1,37 @@
+"""测试 app/infra/db/alembic_support.py 的缓存行为。"""
+
+from __future__ import annotations
+
+import pytest
+
+from app.infra.db import alembic_support
+
+
+@pytest.fixture(autouse=True)
+def _reset_cache():
+    alembic_support.clear_alembic_cache()
+    yield
+    alembic_support.clear_alembic_cache()
+
+
+def test_head_revision_is_cached(monkeypatch: pytest.MonkeyPatch) -> None:
+    """head 只解析一次脚本目录，clear_alembic_cache 后重新解析。"""
+    calls: list[object] = []
+    original = alembic_support.ScriptDirectory.from_config
+
+    def counting_from_config(config):
+        calls.append(config)
+        return original(config)
+
+    monkeypatch.setattr(
+        alembic_support.ScriptDirectory, "from_config", counting_from_config
+    )
+
+    head = alembic_support.get_head_revision()
+    assert head is not None
+    assert alembic_support.get_head_revision() == head
+    assert len(calls) == 1
+
+    alembic_support.clear_alembic_cache()
+    assert alembic_support.get_head_revision() == head
+    assert len(calls) == 2
@@ -0,0 +1,90 @@
+"""测试 app/infra/db/session.py 的引擎与会话工厂缓存。"""
+
+from __future__ import annotations
+
+import pytest
+
+from app.common.config import get_settings
+from app.infra.db import session as db_session
+
+
+@pytest.fixture(autouse=True)
+def _reset_engine():
+    db_session.reset_engine()
+    yield
+    db_session.reset_engine()
+
+
+def test_session_factory_is_cached_and_bound_to_engine() -> None:
+    factory = db_session.get_session_factory()
+    assert db_session.get_session_factory() is factory
+    assert factory.kw["bind"] is db_session.get_engine()
+
+
+def test_reset_engine_rebuilds_engine_and_factory() -> None:
+    engine = db_session.get_engine()
+    factory = db_session.get_session_factory()
+    db_session.reset_engine()
+    assert db_session.get_engine() is not engine
+    assert db_session.get_session_factory() is not factory
+
+
+def test_engine_pool_uses_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("DB_POOL_SIZE", "7")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "3")
+    get_settings.cache_clear()
+    try:
+        pool = db_session.get_engine().pool
+        assert pool.size() == 7
+        assert pool._max_overflow == 3  # type: ignore[attr-defined]
+    finally:
+        get_settings.cache_clear()
+
+
+def test_asyncpg_params_translate_libpq_query() -> None:
+    dsn, server_settings = db_session._asyncpg_connect_params(
+        "postgresql+psycopg://user:secret@db:5432/ndr?sslmode=require"
+        "&connect_timeout=5&keepalives=1&application_name=ndr"
+        "&options=-c%20search_path%3Dapp%20-cstatement_timeout%3D5s"
+    )
+    assert dsn == (
+        "postgresql://user:secret@db:5432/ndr?application_name=ndr&sslmode=require"
+    )
+    assert server_settings == {"search_path": "app", "statement_timeout": "5s"}
+
+
+def test_async_engine_uses_single_connection_pool() -> None:
+    pool = db_session.get_async_engine().pool
+    try:
+        assert pool.size() == db_session.ASYNC_POOL_SIZE == 1
+        assert pool._max_overflow == 0  # type: ignore[attr-defined]
+    finally:
+        db_session.get_async_engine.cache_clear()
+        db_session.get_async_session_factory.cache_clear()
+
+
+def test_connect_args_enable_prepared_statements_for_psycopg() -> None:
+    assert db_session._build_connect_args("postgresql+psycopg://u@db/ndr", 5) == {
+        "connect_timeout": 5,
+        "prepare_threshold": db_session.PSYCOPG_PREPARE_THRESHOLD,
+    }
+    assert db_session._build_connect_args("postgresql+psycopg2://u@db/ndr", 5) == {
+        "connect_timeout": 5
+    }
+
+
+def test_json_dumps_accepts_non_string_keys() -> None:
+    assert db_session._json_dumps({1: "a", "b": [1.5]}) == '{"1":"a","b":[1.5]}'
+
+
+def test_json_serializer_returns_bytes_only_for_psycopg() -> None:
+    value = {"body": "正文"}
+    psycopg = db_session._json_serializer("postgresql+psycopg://u@db/ndr")
+    psycopg2 = db_session._json_serializer("postgresql+psycopg2://u@db/ndr")
+    assert psycopg(value) == '{"body":"正文"}'.encode("utf-8")
+    assert psycopg2(value) == '{"body":"正文"}'
+
+
+def test_engine_uses_enlarged_compiled_cache() -> None:
+    cache = db_session.get_engine()._compiled_cache  # type: ignore[attr-defined]
+    assert cache.capacity == db_session.QUERY_CACHE_SIZE
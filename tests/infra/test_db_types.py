@@ -0,0 +1,47 @@
+"""测试 app/infra/db/types.py 中的 ltree 表达式辅助函数。"""
+
+from __future__ import annotations
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.infra.db.models import Node
+from app.infra.db.types import as_ltree, ltree_param, make_lquery, make_ltree
+
+
+def _subtree_stmt(pattern: str):
+    return select(Node).where(as_ltree(Node.path).op("~")(make_lquery(pattern)))
+
+
+def test_lquery_statements_share_compiled_cache_key() -> None:
+    """不同取值生成相同缓存键，SQLAlchemy 可复用编译结果。"""
+    first = _subtree_stmt("a.*{1,}")._generate_cache_key()
+    second = _subtree_stmt("b.c.*{1,}")._generate_cache_key()
+    assert first is not None and first == second
+
+
+def test_multiple_ltree_params_in_one_statement_do_not_collide() -> None:
+    """同一语句中的多个 ltree/lquery 参数各自保留取值。"""
+    stmt = select(Node).where(
+        Node.path == make_ltree("a.b"),
+        as_ltree(Node.path).op("~")(make_lquery("a.*")),
+    )
+    params = stmt.compile(dialect=postgresql.dialect()).params
+    assert sorted(params.values()) == ["a.*", "a.b"]
+
+
+def test_ltree_param_binds_by_name() -> None:
+    """预构建语句中的 ltree 参数按名称在执行时传值。"""
+    stmt = select(Node).where(as_ltree(Node.path).op("<@")(ltree_param("root")))
+    compiled = stmt.compile(dialect=postgresql.dialect())
+    assert "CAST(%(root)s AS LTREE)" in str(compiled)
+    assert compiled.construct_params({"root": "a.b"})["root"] == "a.b"
+
+
+def test_ltree_helpers_share_type_singletons() -> None:
+    """各辅助函数复用同一类型实例，且类型允许进入编译缓存。"""
+    ltree_type = make_ltree("a").type
+    assert as_ltree(Node.path).type is ltree_type
+    assert ltree_param("root").type is ltree_type
+    assert make_lquery("a.*").type is make_lquery("b.*").type
+    assert ltree_type.cache_ok is True
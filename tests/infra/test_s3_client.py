@@ -4,10 +4,46 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from app.infra.storage.client import CompletedPart, MultipartUpload, StorageError
+from app.infra.storage import s3_client
+from app.infra.storage.client import (
+    CompletedPart,
+    MultipartUpload,
+    ObjectHead,
+    StorageError,
+)
 from app.infra.storage.s3_client import S3StorageClient
 
 
+@pytest.mark.parametrize("cls", [CompletedPart, MultipartUpload, ObjectHead])
+def test_storage_value_types_are_frozen_and_slotted(cls):
+    """Value types keep ``__slots__`` (no per-instance ``__dict__``) and stay immutable."""
+    assert "__slots__" in cls.__dict__
+    assert cls.__dataclass_params__.frozen
+
+
+def test_clients_with_same_settings_share_boto_client():
+    """Instances built per request reuse one boto3 client per configuration."""
+    pytest.importorskip("boto3")
+    settings = MagicMock()
+    settings.S3_ENDPOINT_URL = "http://localhost:9000"
+    settings.S3_REGION = "us-east-1"
+    settings.S3_ACCESS_KEY_ID = "test-key"
+    settings.S3_SECRET_ACCESS_KEY = "test-secret"
+    settings.S3_USE_SSL = False
+    settings.S3_ADDRESSING_STYLE = "path"
+    settings.S3_POOL_SIZE = 50
+
+    first = S3StorageClient(settings=settings)
+    second = S3StorageClient(settings=settings)
+    assert first._client is second._client
+    assert first._client.meta.config.max_pool_connections == 50
+    assert first._client.meta.config.tcp_keepalive is True
+    assert first._client.meta.config.retries["mode"] == "adaptive"
+
+    settings.S3_REGION = "eu-west-1"
+    assert S3StorageClient(settings=settings)._client is not first._client
+
+
 class TestS3StorageClient:
     """Test S3StorageClient implementation."""
 
@@ -15,8 +51,10 @@ class TestS3StorageClient:
     def mock_s3(self):
         """Mock boto3 S3 client."""
         mock_client = MagicMock()
+        s3_client._presign_cache.clear()
         with patch.object(S3StorageClient, "_build_client", return_value=mock_client):
             yield mock_client
+        s3_client._presign_cache.clear()
 
     @pytest.fixture
     def mock_settings(self):
@@ -30,6 +68,7 @@ class TestS3StorageClient:
         settings.S3_SECRET_ACCESS_KEY = "test-secret"
         settings.S3_USE_SSL = False
         settings.S3_ADDRESSING_STYLE = "path"
+        settings.S3_POOL_SIZE = 50
         return settings
 
     @pytest.fixture
@@ -77,6 +116,23 @@ class TestS3StorageClient:
         assert url == "https://presigned-url"
         mock_s3.generate_presigned_url.assert_called_once()
 
+    def test_presign_upload_parts_preserves_order(self, client, mock_s3):
+        """Batch presigning returns one URL per part in request order."""
+        mock_s3.generate_presigned_url.side_effect = lambda op, Params, ExpiresIn: (
+            f"https://part-{Params['PartNumber']}"
+        )
+
+        urls = client.presign_upload_parts(
+            bucket="test-bucket",
+            object_key="test/key",
+            upload_id="upload-123",
+            part_numbers=[3, 1, 2],
+            expires_in=3600,
+        )
+
+        assert urls == ["https://part-3", "https://part-1", "https://part-2"]
+        assert mock_s3.generate_presigned_url.call_count == 3
+
     def test_complete_multipart_upload(self, client, mock_s3):
         """Test completing multipart upload."""
         mock_s3.complete_multipart_upload.return_value = {
@@ -149,6 +205,106 @@ class TestS3StorageClient:
         call_args = mock_s3.generate_presigned_url.call_args
         assert "ResponseContentDisposition" not in call_args[1]["Params"]
 
+    def test_presign_download_encodes_filename(self, client, mock_s3):
+        """Quotes are escaped and non-ASCII names carried via RFC 5987."""
+        mock_s3.generate_presigned_url.return_value = "https://download-url"
+
+        client.presign_download(
+            bucket="test-bucket",
+            object_key="test/key",
+            expires_in=900,
+            filename='报告 "v2".pdf',
+        )
+
+        params = mock_s3.generate_presigned_url.call_args[1]["Params"]
+        assert params["ResponseContentDisposition"] == (
+            'attachment; filename="报告 \\"v2\\".pdf"; '
+            "filename*=UTF-8''%E6%8A%A5%E5%91%8A%20%22v2%22.pdf"
+        )
+
+    def test_presign_download_reuses_cached_url(self, client, mock_s3):
+        """Repeated presigns for the same object reuse the signed URL."""
+        mock_s3.generate_presigned_url.side_effect = ["https://url-1", "https://url-2"]
+
+        first = client.presign_download(
+            bucket="test-bucket", object_key="test/key", expires_in=900
+        )
+        second = client.presign_download(
+            bucket="test-bucket", object_key="test/key", expires_in=900
+        )
+        other = client.presign_download(
+            bucket="test-bucket",
+            object_key="test/key",
+            expires_in=900,
+            filename="download.pdf",
+        )
+
+        assert first == second == "https://url-1"
+        assert other == "https://url-2"
+        assert mock_s3.generate_presigned_url.call_count == 2
+
+    def test_presign_cache_keeps_promised_lifetime(self, client, mock_s3):
+        """URLs are signed with a capped surplus over ``expires_in`` and reused
+        only while at least ``expires_in`` seconds of validity remain."""
+        mock_s3.generate_presigned_url.side_effect = ["https://url-1", "https://url-2"]
+
+        with patch.object(s3_client.time, "monotonic", return_value=1000.0):
+            client.presign_download(
+                bucket="test-bucket", object_key="test/key", expires_in=900
+            )
+        assert mock_s3.generate_presigned_url.call_args[1]["ExpiresIn"] == 960
+        with patch.object(s3_client.time, "monotonic", return_value=1059.0):
+            cached = client.presign_download(
+                bucket="test-bucket", object_key="test/key", expires_in=900
+            )
+        with patch.object(s3_client.time, "monotonic", return_value=1060.0):
+            renewed = client.presign_download(
+                bucket="test-bucket", object_key="test/key", expires_in=900
+            )
+
+        assert cached == "https://url-1"
+        assert renewed == "https://url-2"
+
+    def test_presign_surplus_is_a_tenth_for_short_lifetimes(self, client, mock_s3):
+        """Short lifetimes get a proportional surplus; tiny ones are not cached."""
+        mock_s3.generate_presigned_url.side_effect = ["u1", "u2", "u3"]
+
+        client.presign_download(bucket="b", object_key="k", expires_in=300)
+        assert mock_s3.generate_presigned_url.call_args[1]["ExpiresIn"] == 330
+
+        first = client.presign_download(bucket="b", object_key="k", expires_in=5)
+        second = client.presign_download(bucket="b", object_key="k", expires_in=5)
+        assert (first, second) == ("u2", "u3")
+
+    def test_presign_cache_is_keyed_on_credentials(self, mock_s3, mock_settings):
+        """Rotating the access key never returns URLs signed with the old key."""
+        mock_s3.generate_presigned_url.side_effect = ["https://old", "https://new"]
+
+        old = S3StorageClient(settings=mock_settings).presign_download(
+            bucket="b", object_key="k", expires_in=900
+        )
+        mock_settings.S3_ACCESS_KEY_ID = "rotated-key"
+        new = S3StorageClient(settings=mock_settings).presign_download(
+            bucket="b", object_key="k", expires_in=900
+        )
+
+        assert (old, new) == ("https://old", "https://new")
+
+    def test_presign_not_cached_beyond_sigv4_limit(self, client, mock_s3):
+        """Lifetimes that cannot be doubled within seven days are not cached."""
+        mock_s3.generate_presigned_url.side_effect = ["https://url-1", "https://url-2"]
+        week = s3_client.PRESIGN_MAX_EXPIRES_SECONDS
+
+        first = client.presign_upload_part(
+            bucket="b", object_key="k", upload_id="u", part_number=1, expires_in=week
+        )
+        second = client.presign_upload_part(
+            bucket="b", object_key="k", upload_id="u", part_number=1, expires_in=week
+        )
+
+        assert (first, second) == ("https://url-1", "https://url-2")
+        assert mock_s3.generate_presigned_url.call_args[1]["ExpiresIn"] == week
+
     def test_head_object(self, client, mock_s3):
         """Test getting object metadata."""
         mock_s3.head_object.return_value = {
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Sequence
 
 from app.infra.storage.client import CompletedPart, MultipartUpload, ObjectHead
 
@@ -50,6 +50,26 @@ class MockStorageClient:
     ) -> str:
         return f"https://mock-s3/{bucket}/{object_key}?uploadId={upload_id}&partNumber={part_number}"
 
+    def presign_upload_parts(
+        self,
+        *,
+        bucket: str,
+        object_key: str,
+        upload_id: str,
+        part_numbers: Sequence[int],
+        expires_in: int = 3600,
+    ) -> list[str]:
+        return [
+            self.presign_upload_part(
+                bucket=bucket,
+                object_key=object_key,
+                upload_id=upload_id,
+                part_number=part_number,
+                expires_in=expires_in,
+            )
+            for part_number in part_numbers
+        ]
+
     def complete_multipart_upload(
         self,
         *,
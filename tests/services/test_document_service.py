@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import pytest
+from sqlalchemy.exc import InvalidRequestError
 
 from app.app.services import (
     DocumentCreateData,
@@ -188,6 +189,27 @@ def test_document_version_history_and_restore(session):
     assert restored.content == {"body": "v1"}
 
 
+def test_document_version_list_pages_in_descending_order(session):
+    service = DocumentService(session)
+    version_service = DocumentVersionService(session)
+
+    doc = service.create_document(
+        DocumentCreateData(title="Paged", metadata={}, content={"body": "v1"}),
+        user_id="author",
+    )
+    for body in ("v2", "v3", "v4"):
+        service.update_document(
+            doc.id, DocumentUpdateData(content={"body": body}), user_id="editor"
+        )
+
+    first, total = version_service.list_versions(doc.id, page=1, size=3)
+    second, _ = version_service.list_versions(doc.id, page=2, size=3)
+    assert total == 4
+    assert [v.version_number for v in first] == [4, 3, 2]
+    assert [v.version_number for v in second] == [1]
+    assert second[0].snapshot_content == {"body": "v1"}
+
+
 def test_purge_document_requires_soft_delete(session):
     document_service = DocumentService(session)
     node_service = NodeService(session)
@@ -249,6 +271,21 @@ def test_list_documents_filters_by_ids_and_type(session):
     assert {d.id for d in items_combo} == {d3.id}
 
 
+def test_list_documents_raises_on_relationship_lazy_load(session):
+    service = DocumentService(session)
+    service.create_document(
+        DocumentCreateData(title="D1", metadata={}, content={}), user_id="u"
+    )
+    session.expunge_all()
+
+    items, _ = service.list_documents(page=1, size=10)
+
+    # 列表结果只读取列属性；访问关联应立即报错而不是逐行懒加载
+    assert items[0].title == "D1"
+    with pytest.raises(InvalidRequestError):
+        _ = items[0].nodes
+
+
 def test_reorder_documents_does_not_create_versions(session):
     service = DocumentService(session)
     version_service = DocumentVersionService(session)
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import pytest
+from sqlalchemy import inspect
 
 from app.app.services.asset_service import (
     AssetMultipartInitData,
@@ -15,6 +16,8 @@ from app.app.services.node_asset_service import (
     NodeAssetService,
 )
 from app.app.services.node_service import NodeCreateData, NodeNotFoundError, NodeService
+from app.domain.repositories.node_asset_repository import NodeAssetRepository
+from app.infra.db.models import Asset
 from app.infra.db.session import get_session_factory
 from tests.services.mock_storage import MockStorageClient
 
@@ -313,3 +316,18 @@ class TestListAssetsForNode:
 
         assert len(assets) == 1
         assert assets[0].filename == "asset1.pdf"
+
+    def test_eager_loads_requested_relationships(
+        self, session, node_service, asset_service, node_asset_service
+    ):
+        node = _create_node(node_service, "Node", "node")
+        asset = _create_asset(asset_service, "asset1.pdf")
+        node_asset_service.bind(node.id, asset.id, user_id="u1")
+        session.expire_all()
+
+        assets = NodeAssetRepository(session).list_assets_for_node(
+            node.id, eager=(Asset.nodes,)
+        )
+
+        assert "nodes" not in inspect(assets[0]).unloaded
+        assert [rel.node_id for rel in assets[0].nodes] == [node.id]